@@ -0,0 +1,88 @@
+"""
+Solace - Adaptive Retrieval Depth
+
+RETRIEVAL_K=50 is only worth paying for when the dense scores can't tell the
+candidates apart. Search starts with a small probe (ADAPTIVE_K_PROBE hits)
+and the score distribution of that probe picks the plan:
+
+- peaked: the top RETRIEVAL_N stand clear of the rest by `peak_margin`
+  -> keep the probe, skip the hosted rerank (dense order is already confident)
+- steep:  scores fall off quickly across the probe
+  -> search 2x the probe, rerank a smaller candidate set
+- flat:   the probe is nearly tied
+  -> widen past RETRIEVAL_K to `max_k` so the reranker has more to choose from
+- normal: everything else -> RETRIEVAL_K as before
+
+The plan only depends on the top few scores, so it is the same whether it is
+computed on the probe or on the widened result list.
+"""
+
+DEFAULT_PROBE_K = 10
+DEFAULT_MAX_K = 100
+DEFAULT_PEAK_MARGIN = 0.05  # Cosine gap between the Nth and (N+1)th hit
+DEFAULT_STEEP_SPREAD = 0.12  # Cosine drop from the 1st to the last probe hit
+DEFAULT_FLAT_SPREAD = 0.02
+
+EWMA_ALPHA = 0.2
+
+
+class KPlan:
+    """Chosen search depth and whether the candidates still need the hosted rerank"""
+
+    def __init__(self, mode: str, k: int, rerank: bool):
+        self.mode = mode
+        self.k = k
+        self.rerank = rerank
+
+    def __repr__(self):
+        return f"KPlan({self.mode}, k={self.k}, rerank={self.rerank})"
+
+
+def match_scores(matches):
+    return [float(getattr(match, '_score', getattr(match, 'score', 0)) or 0) for match in matches]
+
+
+def plan_k(scores, n: int, base_k: int, probe_k: int = DEFAULT_PROBE_K, max_k: int = DEFAULT_MAX_K,
+           peak_margin: float = DEFAULT_PEAK_MARGIN, steep_spread: float = DEFAULT_STEEP_SPREAD,
+           flat_spread: float = DEFAULT_FLAT_SPREAD) -> KPlan:
+    """Pick the search depth from the (descending) dense scores of the probe"""
+    probe_k = max(probe_k, n + 1)
+    scores = list(scores)[:probe_k]
+    if len(scores) < probe_k:
+        # The filter matched fewer chunks than the probe - nothing more to fetch
+        return KPlan("exhausted", probe_k, rerank=len(scores) > n)
+
+    if scores[n - 1] - scores[n] >= peak_margin:
+        return KPlan("peaked", probe_k, rerank=False)
+
+    spread = scores[0] - scores[-1]
+    if spread >= steep_spread:
+        return KPlan("steep", min(base_k, 2 * probe_k), rerank=True)
+    if spread <= flat_spread:
+        return KPlan("flat", max(base_k, max_k), rerank=True)
+    return KPlan("normal", base_k, rerank=True)
+
+
+class LatencyModel:
+    """EWMA latency per request size (hits returned / documents reranked) for one stage
+
+    Sizes take a handful of discrete values (probe, 2x probe, RETRIEVAL_K, ...),
+    so each gets its own average; an unseen size borrows the nearest one.
+    """
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self.ms_by_size = {}
+
+    def observe(self, size: int, elapsed_ms: float):
+        previous = self.ms_by_size.get(size)
+        self.ms_by_size[size] = elapsed_ms if previous is None else previous + self.alpha * (elapsed_ms - previous)
+
+    def estimate(self, size: int):
+        """Expected ms for `size` (0 for size 0, None until anything has been observed)"""
+        if size <= 0:
+            return 0.0
+        if not self.ms_by_size:
+            return None
+        nearest = min(self.ms_by_size, key=lambda observed: abs(observed - size))
+        return self.ms_by_size[nearest]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Solace - Event-Loop Lag Benchmark
+
+Shows what blocking SDK calls do to the event loop under concurrent load.
+Each simulated request makes the same sequence of blocking upstream calls
+recommend_verses_stream does (embed -> search -> rerank), either inline on
+the loop (the old behavior) or through the bounded BlockingPools. Upstream
+latency is simulated with time.sleep, which blocks like the SDKs' HTTP calls.
+
+Reports event-loop lag (how late the loop wakes up) and wall time.
+
+Usage:
+    python bench_event_loop.py [--concurrency 20] [--embed-ms 60] [--search-ms 120] [--rerank-ms 250]
+"""
+
+import argparse
+import asyncio
+import time
+
+from executors import BlockingPool, LoopLagMonitor
+
+
+def upstream_call(ms: float):
+    time.sleep(ms / 1000)
+
+
+async def simulated_request(stages, pool: BlockingPool = None):
+    for ms in stages:
+        if pool is None:
+            upstream_call(ms)
+        else:
+            await pool.run(upstream_call, ms)
+        await asyncio.sleep(0)  # Yield between stages like the SSE handler does
+
+
+async def run_load(concurrency: int, stages, pool: BlockingPool = None):
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor_task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)  # Baseline samples before the burst
+
+    start = time.perf_counter()
+    await asyncio.gather(*(simulated_request(stages, pool) for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    await asyncio.sleep(monitor.interval * 2)  # Record the last (possibly late) wake-up
+    monitor_task.cancel()
+    return monitor.stats(), wall
+
+
+def print_row(label: str, stats: dict, wall: float):
+    print(
+        f"   {label:<22} loop lag p50={stats['p50_ms']:>7.1f}ms  p99={stats['p99_ms']:>7.1f}ms  "
+        f"max={stats['max_ms']:>7.1f}ms   wall={wall:.2f}s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event-loop lag: inline vs executor SDK calls")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--embed-ms", type=float, default=60)
+    parser.add_argument("--search-ms", type=float, default=120)
+    parser.add_argument("--rerank-ms", type=float, default=250)
+    parser.add_argument("--workers", type=int, default=16, help="Pinecone pool size")
+    args = parser.parse_args()
+
+    stages = [args.embed_ms, args.search_ms, args.rerank_ms]
+
+    print("=" * 70)
+    print("⏱️  Solace Event-Loop Lag Benchmark")
+    print("=" * 70)
+    print(f"📝 {args.concurrency} concurrent requests, upstream stages {stages} ms")
+
+    stats, wall = await run_load(args.concurrency, stages)
+    print_row("inline (blocking)", stats, wall)
+
+    pool = BlockingPool("pinecone", args.workers)
+    stats, wall = await run_load(args.concurrency, stages, pool)
+    print_row(f"executor ({args.workers} workers)", stats, wall)
+    pool.shutdown()
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Solace - Local Retrieval Benchmark
+
+Recall@k vs latency of the local retrieval engines against exact
+(brute-force) search, on the Bible + Harry Potter stores written by the
+ingestion scripts.
+
+Queries are the fixed QUERY_SET embedded with Pinecone Inference when
+PINECONE_API_KEY is set; otherwise a random sample of stored chunk vectors
+(with a little noise) stands in for real queries.
+
+The `prefilter` mode instead measures the rerank pre-filter (prefilter.py)
+against the full 50-candidate hosted rerank, using live Pinecone search.
+
+Usage:
+    python bench_retrieval.py hnsw [--k 10] [--queries 200]
+    python bench_retrieval.py ivfpq [--m 64] [--save ../data/store/ivfpq.npz]
+    python bench_retrieval.py int8
+    python bench_retrieval.py prefilter [--keep 10 12 15]   (needs PINECONE_API_KEY)
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+
+from local_index import LocalIndex
+from hnsw_index import HnswIndex
+from ivfpq_index import IvfPqIndex
+from int8_index import Int8Index
+from prefilter import prefilter_candidates
+
+load_dotenv()
+
+PINECONE_API_KEY = os.getenv("PINECONE_API_KEY", "")
+PINECONE_INDEX_HOST = "solace-t42ww4d.svc.aped-4627-b74a.pinecone.io"
+LOCAL_INDEX_DIRS = os.getenv("LOCAL_INDEX_DIRS", "../data/store/bible,../data/store/harry_potter").split(",")
+EMBED_MODEL = "llama-text-embed-v2"
+
+# Fixed set of concerns, in the style users actually type
+QUERY_SET = [
+    "I'm anxious about work",
+    "I feel like an outsider",
+    "I'm grieving the loss of my father",
+    "I can't sleep because I'm worried about money",
+    "My friends betrayed me",
+    "I feel like a failure",
+    "I'm scared about my surgery tomorrow",
+    "I'm lonely since moving to a new city",
+    "I don't know what to do with my life",
+    "My marriage is falling apart",
+    "I'm angry at my brother",
+    "I feel guilty about something I did",
+    "I'm exhausted from caring for my sick mother",
+    "I'm nervous about my exams",
+    "I lost my job today",
+    "I feel like nobody understands me",
+    "I'm afraid of the future",
+    "I miss my grandmother",
+    "I'm struggling to forgive someone",
+    "I feel hopeless",
+]
+
+# Testament filters used by recommend_verses_stream
+FILTERS = {
+    "all": None,
+    "jewish": ["OT"],
+    "christian": ["OT", "NT"],
+    "harry_potter": ["HP"],
+}
+
+
+def load_queries(local_index, n: int, seed: int = 0):
+    """Embed QUERY_SET if Pinecone is configured, else sample noisy stored vectors"""
+    if PINECONE_API_KEY:
+        from pinecone import Pinecone
+
+        pc = Pinecone(api_key=PINECONE_API_KEY)
+        embeddings = pc.inference.embed(
+            model=EMBED_MODEL,
+            inputs=QUERY_SET,
+            parameters={"input_type": "query", "truncate": "END"}
+        )
+        vectors = [e.values if hasattr(e, 'values') else e['values'] for e in embeddings.data]
+        print(f"📝 Using {len(vectors)} embedded queries from QUERY_SET")
+        return np.asarray(vectors, dtype=np.float32)
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n):
+        segment = local_index.segments[rng.integers(len(local_index.segments))]
+        rows.append(np.asarray(segment.vectors[rng.integers(len(segment))], dtype=np.float32))
+    queries = np.stack(rows)
+    queries += rng.normal(scale=0.3 / np.sqrt(queries.shape[1]), size=queries.shape).astype(np.float32)
+    print(f"📝 PINECONE_API_KEY not set - using {n} sampled stored vectors as queries")
+    return queries
+
+
+def match_ids(matches):
+    return [m._id for m in matches]
+
+
+def recall_at_k(approx_ids, exact_ids, k: int) -> float:
+    exact = set(exact_ids[:k])
+    if not exact:
+        return 1.0
+    return len(exact & set(approx_ids[:k])) / len(exact)
+
+
+def run_searches(search_fn, queries):
+    """Run one search per query; returns (id lists, latencies in ms)"""
+    results = []
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        matches = search_fn(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(match_ids(matches))
+    return results, np.asarray(latencies)
+
+
+def exact_results(local_index, queries, k: int):
+    """Ground truth + baseline latency per filter"""
+    truth = {}
+    for name, testament_filter in FILTERS.items():
+        truth[name] = run_searches(lambda q: local_index.search(q, k, testament_filter), queries)
+    return truth
+
+
+def print_row(engine, setting, name, recall, latencies):
+    print(
+        f"   {engine:<8} {setting:<16} {name:<13} recall@k={recall:.3f}   "
+        f"p50={np.percentile(latencies, 50):7.3f}ms   p99={np.percentile(latencies, 99):7.3f}ms"
+    )
+
+
+def print_exact(truth):
+    for name, (_, latencies) in truth.items():
+        print_row("exact", "-", name, 1.0, latencies)
+
+
+def bench_hnsw(local_index, queries, k: int, truth):
+    print("\n🕸️  Building HNSW index...")
+    start = time.perf_counter()
+    index = HnswIndex.build(local_index)
+    print(f"   ✓ Built in {time.perf_counter() - start:.1f}s")
+
+    print(f"\n📊 Recall@{k} vs latency (HNSW vs exact)")
+    print_exact(truth)
+    for ef_search in [16, 32, 64, 128, 256]:
+        index.set_ef_search(ef_search)
+        for name, testament_filter in FILTERS.items():
+            results, latencies = run_searches(lambda q: index.search(q, k, testament_filter), queries)
+            recall = np.mean([recall_at_k(r, t, k) for r, t in zip(results, truth[name][0])])
+            print_row("hnsw", f"ef_search={ef_search}", name, recall, latencies)
+
+
+def bench_ivfpq(local_index, queries, k: int, truth, m: int, save_path: str = None):
+    print(f"\n🗜️  Building IVF-PQ index (m={m})...")
+    start = time.perf_counter()
+    index = IvfPqIndex.build(local_index, m=m)
+    float32_mb = len(local_index) * local_index.dimension * 4 / 1024 / 1024
+    print(f"   ✓ Built in {time.perf_counter() - start:.1f}s - {index.nbytes / 1024 / 1024:.2f} MB "
+          f"(float32 matrix: {float32_mb:.1f} MB)")
+
+    if save_path:
+        index.save(save_path)
+        print(f"   ✓ Saved to {save_path}")
+
+    print(f"\n📊 Recall@{k} vs latency (IVF-PQ vs exact)")
+    print_exact(truth)
+    for nprobe in [4, 16, 64]:
+        for rescore in [0, 50, 200]:
+            index.nprobe, index.rescore = nprobe, rescore
+            for name, testament_filter in FILTERS.items():
+                results, latencies = run_searches(lambda q: index.search(q, k, testament_filter), queries)
+                recall = np.mean([recall_at_k(r, t, k) for r, t in zip(results, truth[name][0])])
+                print_row("ivfpq", f"np={nprobe},rs={rescore}", name, recall, latencies)
+
+
+def bench_int8(local_index, queries, k: int, truth):
+    print("\n🔢 Loading int8 index...")
+    index = Int8Index.load(local_index, LOCAL_INDEX_DIRS)
+    float32_mb = len(local_index) * local_index.dimension * 4 / 1024 / 1024
+    print(f"   ✓ {index.nbytes / 1024 / 1024:.1f} MB (float32 matrix: {float32_mb:.1f} MB)")
+
+    # Score fidelity: int8 approximate scores vs float32 scores over the full corpus
+    errors = []
+    correlations = []
+    for query in queries:
+        query = query / np.linalg.norm(query)
+        for segment in index.segments:
+            exact = np.asarray(segment.segment.vectors, dtype=np.float32) @ query
+            approx = segment.approx_scores(query)
+            errors.append(np.abs(approx - exact))
+            correlations.append(np.corrcoef(approx, exact)[0, 1])
+    errors = np.concatenate(errors)
+    print(f"\n🎯 Score fidelity vs float32: mean |err|={errors.mean():.5f}   "
+          f"p99 |err|={np.percentile(errors, 99):.5f}   max |err|={errors.max():.5f}   "
+          f"pearson r={np.mean(correlations):.5f}")
+
+    print(f"\n📊 Recall@{k} vs latency (int8 vs exact)")
+    print_exact(truth)
+    for rerank in [0, 10, 50]:
+        index.rerank = rerank
+        for name, testament_filter in FILTERS.items():
+            results, latencies = run_searches(lambda q: index.search(q, k, testament_filter), queries)
+            recall = np.mean([recall_at_k(r, t, k) for r, t in zip(results, truth[name][0])])
+            print_row("int8", f"rerank={rerank}", name, recall, latencies)
+
+
+def bench_prefilter(keep_values, retrieval_k: int = 50, top_n: int = 3):
+    """Recall of the local pre-filter against the full hosted rerank of all candidates"""
+    if not PINECONE_API_KEY:
+        print("❌ PINECONE_API_KEY not set - the prefilter benchmark needs live search + rerank")
+        return
+
+    from pinecone import Pinecone
+
+    pc = Pinecone(api_key=PINECONE_API_KEY)
+    index = pc.Index(host=PINECONE_INDEX_HOST)
+
+    def rerank_ids(query, hits):
+        documents = [{"id": hit._id, "text": hit.fields.get("text", "")} for hit in hits]
+        reranked = pc.inference.rerank(
+            model="pinecone-rerank-v0",
+            query=query,
+            documents=documents,
+            top_n=top_n,
+            rank_fields=["text"],
+            return_documents=True,
+            parameters={"truncate": "END"}
+        )
+        return {item.document.get("id") for item in reranked.data}
+
+    traditions = ["christian", "jewish", "harry_potter"]
+    print(f"\n✂️  Pre-filter vs full rerank ({len(QUERY_SET)} queries x {len(traditions)} traditions, k={retrieval_k})")
+
+    stats = {keep: {"candidate": [], "final": [], "payload": []} for keep in keep_values}
+    for name in traditions:
+        for query in QUERY_SET:
+            results = index.search(
+                namespace="__default__",
+                query={"inputs": {"text": query}, "top_k": retrieval_k, "filter": {"testament": {"$in": FILTERS[name]}}},
+                fields=["text", "book_name"]
+            )
+            hits = results.result.hits or []
+            if not hits:
+                continue
+
+            full = rerank_ids(query, hits)
+            full_chars = sum(len(hit.fields.get("text", "")) for hit in hits) or 1
+            for keep in keep_values:
+                pruned = prefilter_candidates(query, hits, keep)
+                stats[keep]["candidate"].append(len(full & {hit._id for hit in pruned}) / len(full))
+                stats[keep]["final"].append(len(full & rerank_ids(query, pruned)) / len(full))
+                stats[keep]["payload"].append(sum(len(hit.fields.get("text", "")) for hit in pruned) / full_chars)
+
+    for keep in keep_values:
+        print(
+            f"   keep={keep:<3} candidate recall={np.mean(stats[keep]['candidate']):.3f}   "
+            f"top-{top_n} recall={np.mean(stats[keep]['final']):.3f}   "
+            f"rerank payload={np.mean(stats[keep]['payload']) * 100:.0f}% of full"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local retrieval recall/latency benchmark")
+    parser.add_argument("engine", choices=["hnsw", "ivfpq", "int8", "prefilter"])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200, help="Sampled queries when Pinecone is not configured")
+    parser.add_argument("--m", type=int, default=64, help="IVF-PQ sub-quantizers (bytes per chunk)")
+    parser.add_argument("--save", default=None, help="Save the built IVF-PQ index to this path")
+    parser.add_argument("--keep", type=int, nargs="+", default=[10, 12, 15], help="Pre-filter sizes to evaluate")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("📈 Solace Local Retrieval Benchmark")
+    print("=" * 70)
+
+    if args.engine == "prefilter":
+        bench_prefilter(args.keep)
+        print("=" * 70)
+        return
+
+    local_index = LocalIndex.load(LOCAL_INDEX_DIRS)
+    print(f"📚 Loaded {len(local_index):,} chunks (dim={local_index.dimension})")
+
+    queries = load_queries(local_index, args.queries)
+    truth = exact_results(local_index, queries, args.k)
+
+    if args.engine == "hnsw":
+        bench_hnsw(local_index, queries, args.k, truth)
+    elif args.engine == "ivfpq":
+        bench_ivfpq(local_index, queries, args.k, truth, args.m, args.save)
+    elif args.engine == "int8":
+        bench_int8(local_index, queries, args.k, truth)
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
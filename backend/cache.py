@@ -0,0 +1,115 @@
+"""
+Solace - In-process Caches
+
+LRU + TTL cache used in front of the retrieval stage. Many concerns are
+near-identical ("I'm anxious", "i am anxious"), so keys are normalized
+before lookup and the cached value is the final Verse list - a hit skips
+embedding, search and rerank entirely.
+
+Bounded by entry count and (approximate) bytes; tracks hits, misses,
+evictions and expirations for /healthz. Thread-safe: the embedding cache is
+read and written from the Pinecone worker pool.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+CONTRACTIONS = {
+    "i'm": "i am", "im": "i am", "i've": "i have", "ive": "i have", "i'll": "i will",
+    "i'd": "i would", "can't": "cannot", "cant": "cannot", "won't": "will not",
+    "don't": "do not", "dont": "do not", "doesn't": "does not", "didn't": "did not",
+    "isn't": "is not", "aren't": "are not", "it's": "it is", "that's": "that is",
+}
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def normalize_issue(text: str) -> str:
+    """Lowercase, expand common contractions, drop punctuation and extra whitespace"""
+    words = WORD_PATTERN.findall(text.lower().replace("’", "'"))
+    return " ".join(CONTRACTIONS.get(word, word).replace("'", "") for word in words)
+
+
+class LRUCache:
+    """LRU cache with per-entry TTL and entry/byte bounds"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float = None, max_bytes: int = None, sizeof=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.entries = OrderedDict()  # key -> (expires_at, size, value)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            return self._get(key)
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        size = self.sizeof(value)
+        with self.lock:
+            self._put(key, value, size)
+
+    def _put(self, key, value, size):
+        if key in self.entries:
+            self._remove(key)
+
+        if self.max_bytes and size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self.entries[key] = (expires_at, size, value)
+        self.bytes += size
+
+        while len(self.entries) > self.max_entries or (self.max_bytes and self.bytes > self.max_bytes):
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.bytes -= size
+
+    def stats(self) -> dict:
+        with self.lock:
+            return self._stats()
+
+    def _stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,100 @@
+"""
+Solace - Circuit Breaker
+
+When the hosted reranker is over quota (or just slow), every request used to
+wait for a failing call before falling back to the diversity filter. The
+breaker watches a rolling window of recent calls:
+
+- closed:    calls go through; once `min_calls` are in the window and the share
+             of failures (errors + calls slower than `slow_call_ms`) reaches
+             `failure_rate`, the breaker opens
+- open:      calls are skipped immediately for `open_seconds`
+- half_open: a single probe call is let through; success closes the breaker,
+             failure opens it again (a probe that never reports back - e.g. a
+             cancelled request - expires after `open_seconds`)
+"""
+
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate + slow-call breaker with half-open probing"""
+
+    def __init__(self, name: str, failure_rate: float = 0.5, slow_call_ms: float = None,
+                 window: int = 20, min_calls: int = 5, open_seconds: float = 30.0):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_ms = slow_call_ms
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.outcomes = deque(maxlen=window)  # True = failure (error or slow call)
+        self.state = CLOSED
+        self.opened_at = None
+        self.probe_started_at = None
+        self.skipped = 0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        """Whether the next call may go upstream (in half-open, reserves the probe)"""
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self.opened_at < self.open_seconds:
+                self.skipped += 1
+                return False
+            self.state = HALF_OPEN
+            self.probe_started_at = None
+
+        if self.state == HALF_OPEN:
+            if self.probe_started_at is not None and now - self.probe_started_at < self.open_seconds:
+                self.skipped += 1
+                return False
+            self.probe_started_at = now
+
+        return True
+
+    def record_success(self, elapsed_ms: float):
+        if self.slow_call_ms and elapsed_ms > self.slow_call_ms:
+            self._record(failed=True)
+        else:
+            self._record(failed=False)
+
+    def record_failure(self):
+        self._record(failed=True)
+
+    def _record(self, failed: bool):
+        if self.state == HALF_OPEN:
+            if failed:
+                self._open()
+            else:
+                self.state = CLOSED
+                self.outcomes.clear()
+                print(f"✓ {self.name} circuit closed", flush=True)
+            return
+
+        self.outcomes.append(failed)
+        if self.state == CLOSED and len(self.outcomes) >= self.min_calls:
+            if sum(self.outcomes) / len(self.outcomes) >= self.failure_rate:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.probe_started_at = None
+        self.trips += 1
+        print(f"⚠️  {self.name} circuit open - skipping it for {self.open_seconds:.0f}s", flush=True)
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failure_rate": round(sum(self.outcomes) / len(self.outcomes), 3) if self.outcomes else 0.0,
+            "window_calls": len(self.outcomes),
+            "trips": self.trips,
+            "skipped": self.skipped,
+            "open_for_s": round(max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 1)
+            if self.state == OPEN else 0.0,
+        }
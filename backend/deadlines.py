@@ -0,0 +1,106 @@
+"""
+Solace - Per-request Latency Budget
+
+Nothing upstream used to have a timeout, so a slow search, rerank or first
+LLM token hung the stream. Each request now gets a Budget: a total deadline
+plus per-stage deadlines (search, rerank, first_token), each capped by what
+is left of the total. Callers wrap a stage in asyncio.wait_for(...,
+budget.timeout(stage)) and degrade on overrun:
+
+- search      -> lexical hits if a BM25 index is loaded, otherwise an error
+- rerank      -> format_results diversity path on the dense candidates
+- first_token -> cached explanation for the same verses, or a short fallback
+- total       -> the explanation stops where it is and the stream ends
+
+Deadlines are also handed to the Pinecone SDK calls (`timeout=`) so an
+abandoned search/list/fetch releases its worker thread instead of holding it
+until Pinecone answers.
+
+A stage can also degrade without running out of time (the reranker skipped
+by its circuit breaker, or failing) - budget.fallback(stage) records that.
+Either way the request is reported as degraded (done event) and its results
+aren't cacheable; overruns are also counted per stage.
+"""
+
+import time
+
+STAGES = ("search", "rerank", "first_token", "total")
+
+
+class Budget:
+    """Deadlines for one request; a stage's clock starts at begin(stage)"""
+
+    def __init__(self, stage_ms: dict, total_ms: int = 0, stats=None):
+        self.stage_ms = stage_ms
+        self.started = time.monotonic()
+        self.total_deadline = self.started + total_ms / 1000 if total_ms else None
+        self.deadlines = {"total": self.total_deadline}
+        self.overruns = []
+        self.fallbacks = []  # Stages that degraded without a deadline overrun
+        self.stats = stats
+
+    def begin(self, stage: str):
+        ms = self.stage_ms.get(stage)
+        deadline = time.monotonic() + ms / 1000 if ms else None
+        if self.total_deadline is not None:
+            deadline = self.total_deadline if deadline is None else min(deadline, self.total_deadline)
+        self.deadlines[stage] = deadline
+
+    def deadline(self, stage: str):
+        """time.monotonic() deadline of `stage` (None = unbounded); starts the stage if begin() wasn't called"""
+        if stage not in self.deadlines:
+            self.begin(stage)
+        return self.deadlines[stage]
+
+    def timeout(self, stage: str):
+        """Seconds left for `stage` (None = unbounded); starts the stage if begin() wasn't called"""
+        deadline = self.deadline(stage)
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    def overrun(self, stage: str):
+        # A stage that ran into the total deadline is reported as "total"
+        deadline = self.deadlines.get(stage)
+        if stage != "total" and deadline is not None and deadline == self.total_deadline:
+            stage = "total"
+        if stage not in self.overruns:
+            self.overruns.append(stage)
+            if self.stats is not None:
+                self.stats.record(stage)
+        print(f"⏱️  {stage} deadline exceeded after {(time.monotonic() - self.started) * 1000:.0f}ms - degrading", flush=True)
+        return stage
+
+
+    def fallback(self, stage: str):
+        """`stage` degraded for another reason than its deadline (e.g. reranker skipped or failed)"""
+        if stage not in self.fallbacks:
+            self.fallbacks.append(stage)
+
+    @property
+    def degraded(self) -> list:
+        return self.overruns + [stage for stage in self.fallbacks if stage not in self.overruns]
+
+    @property
+    def cacheable(self) -> bool:
+        """Only full-quality results go into the result and semantic caches"""
+        return not self.degraded
+
+
+class BudgetStats:
+    """Overrun counters per stage for /healthz"""
+
+    def __init__(self, stage_ms: dict, total_ms: int):
+        self.stage_ms = stage_ms
+        self.total_ms = total_ms
+        self.overruns = {stage: 0 for stage in STAGES}
+
+    def record(self, stage: str):
+        self.overruns[stage] = self.overruns.get(stage, 0) + 1
+
+    def budget(self) -> Budget:
+        return Budget(self.stage_ms, self.total_ms, stats=self)
+
+    def stats(self) -> dict:
+        return {
+            "budget_ms": {**self.stage_ms, "total": self.total_ms},
+            "overruns": dict(self.overruns),
+        }
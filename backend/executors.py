@@ -0,0 +1,109 @@
+"""
+Solace - Blocking Call Executors + Event-Loop Lag
+
+The Pinecone and Tavily SDKs are synchronous. Called directly from an async
+handler they block the single uvicorn event loop, so one slow upstream stalls
+every concurrent SSE stream. BlockingPool runs those calls on a dedicated,
+bounded thread pool per upstream (the LangSmith trace context is carried
+over), and LoopLagMonitor measures how late the loop wakes up so the effect
+is visible in /healthz and bench_event_loop.py.
+
+A call whose awaiter gives up (asyncio.wait_for deadline, losing hedge) keeps
+its worker until the SDK call returns. Pinecone search/list/fetch get the
+remaining budget as their SDK `timeout=`, which is what frees the thread; in
+case a call outlives it anyway (or has no SDK timeout, like the rerank),
+in-flight counts track the threads and slow stages get their own pool as a
+backstop instead of starving the rest.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+class BlockingPool:
+    """Bounded thread pool for one upstream's blocking SDK calls"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"solace-{name}")
+        self.lock = threading.Lock()
+        self.in_flight = 0  # Submitted and not finished on the worker (abandoned calls included)
+        self.completed = 0
+        self.abandoned = 0
+
+    def _call(self, context, fn, *args, **kwargs):
+        try:
+            return context.run(fn, *args, **kwargs)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """Run `fn` on the pool without blocking the event loop (keeps contextvars, e.g. the trace parent)"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        with self.lock:
+            self.in_flight += 1
+        work = self.executor.submit(functools.partial(self._call, context, fn, *args, **kwargs))
+        try:
+            return await asyncio.wrap_future(work, loop=loop)
+        except asyncio.CancelledError:
+            # Still queued: cancelled with the awaiter; already running: the worker stays busy
+            if work.cancelled():
+                with self.lock:
+                    self.in_flight -= 1
+            else:
+                self.abandoned += 1
+            raise
+
+    def idle_workers(self) -> int:
+        return max(0, self.max_workers - self.in_flight)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "completed": self.completed,
+            "abandoned": self.abandoned,
+        }
+
+
+class LoopLagMonitor:
+    """Samples how late `asyncio.sleep(interval)` wakes up - time the loop spent blocked"""
+
+    def __init__(self, interval: float = 0.05, window: int = 1200):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+
+    async def run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval) * 1000)
+
+    def reset(self):
+        self.samples.clear()
+
+    def stats(self) -> dict:
+        if not self.samples:
+            return {"samples": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        samples = np.fromiter(self.samples, dtype=np.float64)
+        return {
+            "samples": len(samples),
+            "p50_ms": round(float(np.percentile(samples, 50)), 2),
+            "p99_ms": round(float(np.percentile(samples, 99)), 2),
+            "max_ms": round(float(samples.max()), 2),
+        }
@@ -0,0 +1,105 @@
+"""
+Solace - Hedged Requests
+
+Search p99 is dominated by the occasional slow Pinecone response. A hedged
+call starts the request, and if it hasn't answered within the observed
+`percentile` latency, fires an identical second request and takes whichever
+returns first.
+
+- the hedge delay follows a rolling latency window (`min_delay_ms` until
+  enough samples are in)
+- at most `max_rate` of recent calls may hedge, so a slow upstream doesn't
+  get double the traffic
+- the losing request is cancelled; a blocking SDK call keeps its worker
+  thread until its own (SDK-level) timeout, so as a backstop duplicates can
+  run via a separate `hedge_call` (its own small pool) and are only fired
+  while `can_hedge()` says there is capacity for them
+- counters: calls, hedges (rate) and hedge wins
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+DEFAULT_PERCENTILE = 95
+DEFAULT_MIN_DELAY_MS = 50
+MIN_SAMPLES = 20
+
+
+class Hedger:
+    """Percentile-delayed duplicate requests with a hedge-rate cap"""
+
+    def __init__(self, percentile: float = DEFAULT_PERCENTILE, max_rate: float = 0.1,
+                 min_delay_ms: float = DEFAULT_MIN_DELAY_MS, window: int = 500, can_hedge=None):
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_delay_ms = min_delay_ms
+        self.can_hedge = can_hedge
+        self.latencies = deque(maxlen=window)
+        self.recent_hedges = deque(maxlen=window)  # True = that call hedged
+        self.calls = 0
+        self.hedges = 0
+        self.wins = 0
+        self.no_capacity = 0
+
+    def delay_ms(self) -> float:
+        if len(self.latencies) < MIN_SAMPLES:
+            return self.min_delay_ms * 10
+        return max(self.min_delay_ms, float(np.percentile(self.latencies, self.percentile)))
+
+    def _may_hedge(self) -> bool:
+        if self.recent_hedges and sum(self.recent_hedges) / len(self.recent_hedges) >= self.max_rate:
+            return False
+        if self.max_rate <= 0:
+            return False
+        if self.can_hedge is not None and not self.can_hedge():
+            self.no_capacity += 1
+            return False
+        return True
+
+    async def run(self, call, hedge_call=None):
+        """Await `call()`; after the hedge delay, race it against `hedge_call()` (default: `call()`)"""
+        self.calls += 1
+        start = time.perf_counter()
+        pending = {asyncio.ensure_future(call())}
+        hedge = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.delay_ms() / 1000)
+            if not done and self._may_hedge():
+                self.recent_hedges.append(True)
+                self.hedges += 1
+                hedge = asyncio.ensure_future((hedge_call or call)())
+                pending.add(hedge)
+            else:
+                self.recent_hedges.append(False)
+
+            error = None
+            while done or pending:
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is hedge:
+                        self.wins += 1
+                    self.latencies.append((time.perf_counter() - start) * 1000)
+                    return task.result()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            raise error
+        finally:
+            # The loser (or both, if the caller gave up) is cancelled
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_rate": round(self.hedges / self.calls, 3) if self.calls else 0.0,
+            "hedge_wins": self.wins,
+            "skipped_no_capacity": self.no_capacity,
+            "delay_ms": round(self.delay_ms(), 1),
+        }
@@ -0,0 +1,159 @@
+"""
+Solace - HNSW Approximate Nearest Neighbour Index
+
+Graph-based ANN engine for the local retrieval mode (RETRIEVAL_BACKEND=hnsw).
+Brute force is fine at ~37k chunks; this keeps search sub-millisecond as more
+corpora and translations are added.
+
+Wraps hnswlib (optional dependency: `pip install hnswlib`) over the vectors of
+a LocalIndex, which still provides the metadata and texts for each hit.
+Testament filters are applied during graph traversal, so filtered
+searches don't lose recall to post-filtering.
+
+Persisted layout (one directory):
+    hnsw.bin     - hnswlib graph
+    hnsw.json    - build parameters + corpus size (checked on load)
+"""
+
+import json
+import os
+
+import numpy as np
+
+from local_index import normalize_rows, SCORE_BLOCK_ROWS
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+DEFAULT_M = 16
+DEFAULT_EF_CONSTRUCTION = 200
+DEFAULT_EF_SEARCH = 64
+
+
+class HnswIndex:
+    """HNSW index with the same search interface as LocalIndex"""
+
+    def __init__(self, local_index, graph, params, ef_search: int = DEFAULT_EF_SEARCH):
+        self.local_index = local_index
+        self.graph = graph
+        self.params = params
+        self.dimension = local_index.dimension
+
+        # Global label -> (segment, row), plus per-label metadata for filtering
+        self.labels = [(segment, row) for segment in local_index.segments for row in range(len(segment))]
+        self.testaments = np.array([segment.metadata[row].get("testament", "") for segment, row in self.labels])
+        self._filters = {}
+
+        self.set_ef_search(ef_search)
+
+    @staticmethod
+    def _require_hnswlib():
+        if hnswlib is None:
+            raise ImportError("hnswlib is not installed - run `pip install hnswlib` to use RETRIEVAL_BACKEND=hnsw")
+
+    @classmethod
+    def build(cls, local_index, m: int = DEFAULT_M, ef_construction: int = DEFAULT_EF_CONSTRUCTION,
+              ef_search: int = DEFAULT_EF_SEARCH):
+        """Build the graph from every vector in the local index"""
+        cls._require_hnswlib()
+
+        graph = hnswlib.Index(space="ip", dim=local_index.dimension)
+        graph.init_index(max_elements=len(local_index), ef_construction=ef_construction, M=m)
+
+        label = 0
+        for segment in local_index.segments:
+            for start in range(0, len(segment), SCORE_BLOCK_ROWS):
+                block = np.asarray(segment.vectors[start:start + SCORE_BLOCK_ROWS], dtype=np.float32)
+                graph.add_items(block, np.arange(label, label + len(block)))
+                label += len(block)
+
+        params = {"m": m, "ef_construction": ef_construction, "count": len(local_index), "dimension": local_index.dimension}
+        return cls(local_index, graph, params, ef_search=ef_search)
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.graph.save_index(os.path.join(path, "hnsw.bin"))
+        with open(os.path.join(path, "hnsw.json"), "w") as f:
+            json.dump(self.params, f, indent=2)
+
+    @classmethod
+    def load(cls, local_index, path: str, ef_search: int = DEFAULT_EF_SEARCH):
+        """Load a persisted graph; it must have been built from the same stores"""
+        cls._require_hnswlib()
+
+        with open(os.path.join(path, "hnsw.json"), "r") as f:
+            params = json.load(f)
+        if params["count"] != len(local_index) or params["dimension"] != local_index.dimension:
+            raise ValueError(
+                f"HNSW index at {path} was built for {params['count']} x {params['dimension']} vectors, "
+                f"local stores have {len(local_index)} x {local_index.dimension} - rebuild it"
+            )
+
+        graph = hnswlib.Index(space="ip", dim=local_index.dimension)
+        graph.load_index(os.path.join(path, "hnsw.bin"), max_elements=params["count"])
+        return cls(local_index, graph, params, ef_search=ef_search)
+
+    @classmethod
+    def load_or_build(cls, local_index, path: str, ef_search: int = DEFAULT_EF_SEARCH):
+        """Load a persisted graph, building and saving it first if missing"""
+        if os.path.exists(os.path.join(path, "hnsw.json")):
+            return cls.load(local_index, path, ef_search=ef_search)
+
+        index = cls.build(local_index, ef_search=ef_search)
+        index.save(path)
+        return index
+
+    def __len__(self):
+        return len(self.labels)
+
+    def set_ef_search(self, ef_search: int):
+        """Candidate list size at query time - higher = better recall, slower"""
+        self.ef_search = ef_search
+        self.graph.set_ef(ef_search)
+
+    def _filter(self, testament_filter: list = None):
+        """Per-label allow list for filtered traversal (cached per filter)"""
+        if not testament_filter:
+            return None, None
+
+        key = tuple(testament_filter)
+        if key not in self._filters:
+            mask = np.isin(self.testaments, testament_filter)
+            # hnswlib calls the filter with a label and expects a plain bool
+            self._filters[key] = (mask.tolist().__getitem__, mask)
+
+        return self._filters[key]
+
+    def _exact_search(self, query, k: int, mask):
+        """Exact scan of the allowed labels (fallback for very selective filters)"""
+        labels = np.flatnonzero(mask)
+        vectors = np.stack([self.labels[label][0].vectors[self.labels[label][1]] for label in labels])
+        scores = vectors.astype(np.float32) @ query[0]
+
+        top = np.argsort(-scores)[:k]
+        return [self.labels[labels[i]][0].match(self.labels[labels[i]][1], scores[i]) for i in top]
+
+    def search(self, query_vector, k: int, testament_filter: list = None):
+        """Approximate top-k search; returns LocalMatch objects like LocalIndex.search"""
+        query = normalize_rows(np.atleast_2d(query_vector))
+        if query.shape[1] != self.dimension:
+            raise ValueError(f"Query dimension {query.shape[1]} != index dimension {self.dimension}")
+
+        allowed, mask = self._filter(testament_filter)
+        k = min(k, len(self) if mask is None else int(mask.sum()))
+        if k <= 0:
+            return []
+
+        try:
+            labels, distances = self.graph.knn_query(query, k=k, filter=allowed, num_threads=1)
+        except RuntimeError:
+            # Very selective filters can leave the graph walk with fewer than k hits
+            return self._exact_search(query, k, mask)
+
+        matches = []
+        for label, distance in zip(labels[0], distances[0]):
+            segment, row = self.labels[label]
+            matches.append(segment.match(row, 1.0 - float(distance)))
+        return matches
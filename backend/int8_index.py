@@ -0,0 +1,142 @@
+"""
+Solace - Int8 Scalar-Quantized Index
+
+Middle ground between the float store and IVF-PQ (RETRIEVAL_BACKEND=int8).
+Each embedding dimension is quantized to int8 with its own scale, which cuts
+memory 4x vs float32 and makes the brute-force scan a SIMD-friendly int8 dot
+product with int32 accumulation.
+
+Scoring folds the per-dimension scales into the query, quantizes that query
+to int8 too, and accumulates codes . query in int32:
+
+    score ~= query_scale * sum_d codes[i, d] * q8[d]
+
+The top-N approximate hits can optionally be re-ranked with exact float
+scores from the memory-mapped store.
+
+Codes are written by the ingestion export (embeddings_int8.npy +
+int8_scales.npy in each store dir); stores without them are quantized at load.
+"""
+
+import heapq
+import itertools
+import os
+
+import numpy as np
+
+from local_index import normalize_rows, top_k_indices, SCORE_BLOCK_ROWS
+
+DEFAULT_RERANK = 50
+
+
+class Int8Segment:
+    """Int8 codes + per-dimension scales for one store segment"""
+
+    def __init__(self, segment, codes, scales):
+        if len(codes) != len(segment):
+            raise ValueError(f"{len(codes)} int8 codes but {len(segment)} store rows")
+
+        self.segment = segment
+        self.codes = codes
+        self.scales = scales
+
+    @classmethod
+    def open(cls, segment, store_dir: str = None):
+        """Memory-map exported codes if present, otherwise quantize the float vectors"""
+        codes_path = os.path.join(store_dir, "embeddings_int8.npy") if store_dir else None
+        if codes_path and os.path.exists(codes_path):
+            codes = np.load(codes_path, mmap_mode="r")
+            scales = np.load(os.path.join(store_dir, "int8_scales.npy"))
+            return cls(segment, codes, scales)
+
+        # Two blocked passes so the float vectors are never fully materialized
+        max_abs = np.zeros(segment.vectors.shape[1], dtype=np.float32)
+        for start in range(0, len(segment), SCORE_BLOCK_ROWS):
+            block = np.asarray(segment.vectors[start:start + SCORE_BLOCK_ROWS], dtype=np.float32)
+            max_abs = np.maximum(max_abs, np.abs(block).max(axis=0))
+        scales = max_abs / 127.0
+        scales[scales == 0] = 1.0
+
+        codes = np.empty(segment.vectors.shape, dtype=np.int8)
+        for start in range(0, len(segment), SCORE_BLOCK_ROWS):
+            block = np.asarray(segment.vectors[start:start + SCORE_BLOCK_ROWS], dtype=np.float32)
+            codes[start:start + len(block)] = np.clip(np.round(block / scales), -127, 127)
+        return cls(segment, codes, scales)
+
+    def quantize_query(self, query):
+        """Fold the dimension scales into the query and quantize it -> (q8, query_scale)"""
+        scaled = query * self.scales
+        query_scale = np.abs(scaled).max() / 127.0 or 1.0
+        return np.round(scaled / query_scale).astype(np.int8), query_scale
+
+    def approx_scores(self, query, start: int = 0, end: int = None):
+        """Approximate cosine scores for rows [start, end) using int32-accumulated int8 dots"""
+        end = len(self.segment) if end is None else end
+        q8, query_scale = self.quantize_query(query)
+
+        scores = np.empty(end - start, dtype=np.float32)
+        for block_start in range(start, end, SCORE_BLOCK_ROWS):
+            block = self.codes[block_start:min(block_start + SCORE_BLOCK_ROWS, end)]
+            offset = block_start - start
+            scores[offset:offset + len(block)] = np.einsum("ij,j->i", block, q8, dtype=np.int32) * query_scale
+        return scores
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.scales.nbytes
+
+
+class Int8Index:
+    """Int8 brute-force index with the same search interface as LocalIndex"""
+
+    def __init__(self, local_index, segments, rerank: int = DEFAULT_RERANK):
+        self.local_index = local_index
+        self.segments = segments
+        self.rerank = rerank
+        self.dimension = local_index.dimension
+
+    @classmethod
+    def load(cls, local_index, store_dirs=None, rerank: int = DEFAULT_RERANK):
+        store_dirs = store_dirs or [None] * len(local_index.segments)
+        segments = [Int8Segment.open(segment, store_dir) for segment, store_dir in zip(local_index.segments, store_dirs)]
+        return cls(local_index, segments, rerank=rerank)
+
+    def __len__(self):
+        return len(self.local_index)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(segment.nbytes for segment in self.segments)
+
+    def search(self, query_vector, k: int, testament_filter: list = None):
+        """Approximate top-k search; returns LocalMatch objects like LocalIndex.search"""
+        query = normalize_rows(np.atleast_2d(query_vector))[0]
+        if len(query) != self.dimension:
+            raise ValueError(f"Query dimension {len(query)} != index dimension {self.dimension}")
+
+        # Partial top-N per matching partition, merged across partitions
+        shortlist_size = max(k, self.rerank)
+        partials = []
+        for segment in self.segments:
+            for testament, start, end in segment.segment.partitions:
+                if testament_filter and testament not in testament_filter:
+                    continue
+
+                scores = segment.approx_scores(query, start, end)
+                partials.append([
+                    (float(scores[row]), segment.segment, start + int(row))
+                    for row in top_k_indices(scores, shortlist_size)
+                ])
+
+        merged = heapq.merge(*partials, key=lambda c: c[0], reverse=True)
+        shortlist = list(itertools.islice(merged, shortlist_size))
+
+        # Optional exact float re-rank of the shortlist
+        if self.rerank:
+            shortlist = [
+                (float(np.asarray(store.vectors[row], dtype=np.float32) @ query), store, row)
+                for _, store, row in shortlist
+            ]
+            shortlist.sort(key=lambda c: c[0], reverse=True)
+
+        return [store.match(row, score) for score, store, row in shortlist[:k]]
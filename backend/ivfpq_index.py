@@ -0,0 +1,210 @@
+"""
+Solace - IVF-PQ Compressed Index
+
+Inverted-file + product-quantization index for memory-constrained deployments
+(RETRIEVAL_BACKEND=ivfpq). 37k x 1024 float32 embeddings are ~150MB; with 64
+sub-quantizers the codes are 64 bytes per chunk, so the whole resident index
+(codes + coarse centroids + PQ codebooks) is ~5MB.
+
+- Coarse quantizer: k-means into `nlist` inverted lists
+- PQ: each residual (vector - list centroid) is split into `m` sub-vectors,
+  each encoded as one byte (256-centroid codebook per sub-space)
+- Search: probe the `nprobe` closest lists, score candidates with asymmetric
+  distance lookup tables, then optionally re-score the top `rescore` exactly
+  against the float vectors of the memory-mapped store (only those rows are
+  paged in)
+
+Built with plain NumPy k-means; persisted as a single .npz file. Training
+materializes the float32 corpus, so it runs offline (data/local_store.py
+after each export, or bench_retrieval.py --save) - the backend only loads.
+"""
+
+import os
+
+import numpy as np
+
+from local_index import normalize_rows, top_k_indices, SCORE_BLOCK_ROWS
+
+DEFAULT_NLIST = 256
+DEFAULT_SUBQUANTIZERS = 64
+DEFAULT_NPROBE = 16
+DEFAULT_RESCORE = 50
+PQ_CENTROIDS = 256  # One byte per sub-quantizer code
+TRAIN_SAMPLE = 20000
+KMEANS_ITERATIONS = 20
+
+
+def _assign(x, centroids):
+    """Nearest centroid per row (L2), computed in blocks"""
+    half_norms = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+    labels = np.empty(len(x), dtype=np.int64)
+    for start in range(0, len(x), SCORE_BLOCK_ROWS):
+        block = x[start:start + SCORE_BLOCK_ROWS]
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T - half_norms, axis=1)
+    return labels
+
+
+def kmeans(x, k: int, iterations: int = KMEANS_ITERATIONS, seed: int = 0):
+    """Lloyd's k-means; empty clusters are re-seeded from random points"""
+    rng = np.random.default_rng(seed)
+    x = np.asarray(x, dtype=np.float32)
+    k = min(k, len(x))
+    centroids = x[rng.choice(len(x), size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = _assign(x, centroids)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, x)
+
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = x[rng.choice(len(x), size=int(empty.sum()), replace=False)]
+
+    return centroids
+
+
+class IvfPqIndex:
+    """IVF-PQ index with the same search interface as LocalIndex"""
+
+    def __init__(self, local_index, centroids, codebooks, codes, list_offsets, list_labels,
+                 nprobe: int = DEFAULT_NPROBE, rescore: int = DEFAULT_RESCORE):
+        self.local_index = local_index
+        self.centroids = centroids        # (nlist, D) float32
+        self.codebooks = codebooks        # (m, 256, D/m) float32
+        self.codes = codes                # (N, m) uint8, ordered by inverted list
+        self.list_offsets = list_offsets  # (nlist + 1,) start of each list in codes
+        self.list_labels = list_labels    # (N,) global label of each code row
+        self.nprobe = nprobe
+        self.rescore = rescore
+        self.dimension = centroids.shape[1]
+
+        if len(list_labels) != len(local_index):
+            raise ValueError(f"IVF-PQ index has {len(list_labels)} codes, local stores have {len(local_index)} chunks")
+
+        # Global label -> (segment, row); testament per code row for filtering
+        self.labels = [(segment, row) for segment in local_index.segments for row in range(len(segment))]
+        testaments = np.array([segment.metadata[row].get("testament", "") for segment, row in self.labels])
+        self.testament_names, testament_ids = np.unique(testaments, return_inverse=True)
+        self.row_testaments = testament_ids[list_labels].astype(np.uint8)
+
+        # Rows per (list, testament) so filtered queries only probe lists that can match
+        list_ids = np.repeat(np.arange(len(centroids)), np.diff(list_offsets))
+        self.list_testament_counts = np.zeros((len(centroids), len(self.testament_names)), dtype=np.int32)
+        np.add.at(self.list_testament_counts, (list_ids, self.row_testaments), 1)
+
+    @classmethod
+    def build(cls, local_index, nlist: int = DEFAULT_NLIST, m: int = DEFAULT_SUBQUANTIZERS,
+              nprobe: int = DEFAULT_NPROBE, rescore: int = DEFAULT_RESCORE, seed: int = 0):
+        """Train the coarse quantizer + PQ codebooks and encode every chunk"""
+        if local_index.dimension % m:
+            raise ValueError(f"Dimension {local_index.dimension} is not divisible by {m} sub-quantizers")
+
+        vectors = np.concatenate([np.asarray(segment.vectors, dtype=np.float32) for segment in local_index.segments])
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), size=min(TRAIN_SAMPLE, len(vectors)), replace=False)]
+
+        centroids = kmeans(sample, nlist, seed=seed)
+        assignments = _assign(vectors, centroids)
+        residuals = vectors - centroids[assignments]
+
+        dsub = local_index.dimension // m
+        codebooks = np.empty((m, PQ_CENTROIDS, dsub), dtype=np.float32)
+        codes = np.empty((len(vectors), m), dtype=np.uint8)
+        sample_rows = rng.choice(len(vectors), size=min(TRAIN_SAMPLE, len(vectors)), replace=False)
+        for j in range(m):
+            sub = residuals[:, j * dsub:(j + 1) * dsub]
+            book = kmeans(sub[sample_rows], PQ_CENTROIDS, seed=seed + j + 1)
+            # Small corpora can have fewer points than codebook entries
+            codebooks[j] = 0.0
+            codebooks[j, :len(book)] = book
+            codes[:, j] = _assign(sub, book)
+
+        # Order code rows by inverted list
+        order = np.argsort(assignments, kind="stable")
+        list_offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        list_offsets[1:] = np.cumsum(np.bincount(assignments, minlength=len(centroids)))
+
+        return cls(local_index, centroids, codebooks, codes[order], list_offsets, order.astype(np.int32),
+                   nprobe=nprobe, rescore=rescore)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path,
+            centroids=self.centroids,
+            codebooks=self.codebooks,
+            codes=self.codes,
+            list_offsets=self.list_offsets,
+            list_labels=self.list_labels
+        )
+
+    @classmethod
+    def load(cls, local_index, path: str, nprobe: int = DEFAULT_NPROBE, rescore: int = DEFAULT_RESCORE):
+        with np.load(path) as data:
+            return cls(
+                local_index,
+                data["centroids"],
+                data["codebooks"],
+                data["codes"],
+                data["list_offsets"],
+                data["list_labels"],
+                nprobe=nprobe,
+                rescore=rescore
+            )
+
+    def __len__(self):
+        return len(self.list_labels)
+
+    @property
+    def nbytes(self) -> int:
+        """Resident size of the compressed index"""
+        return sum(a.nbytes for a in [
+            self.centroids, self.codebooks, self.codes, self.list_offsets, self.list_labels, self.row_testaments
+        ])
+
+    def _allowed_testaments(self, testament_filter: list = None):
+        if not testament_filter:
+            return None
+        return np.isin(self.testament_names, testament_filter)
+
+    def search(self, query_vector, k: int, testament_filter: list = None):
+        """Approximate top-k search; returns LocalMatch objects like LocalIndex.search"""
+        query = normalize_rows(np.atleast_2d(query_vector))[0]
+        if len(query) != self.dimension:
+            raise ValueError(f"Query dimension {len(query)} != index dimension {self.dimension}")
+
+        allowed = self._allowed_testaments(testament_filter)
+
+        # Coarse step: closest lists that contain at least one allowed row
+        coarse_scores = self.centroids @ query
+        if allowed is not None:
+            coarse_scores[self.list_testament_counts[:, allowed].sum(axis=1) == 0] = -np.inf
+        probe = top_k_indices(coarse_scores, self.nprobe)
+        if len(probe) == 0:
+            return []
+
+        positions = np.concatenate([np.arange(self.list_offsets[i], self.list_offsets[i + 1]) for i in probe])
+        list_scores = np.repeat(coarse_scores[probe], np.diff(self.list_offsets)[probe])
+        if allowed is not None:
+            keep = allowed[self.row_testaments[positions]]
+            positions, list_scores = positions[keep], list_scores[keep]
+
+        # Asymmetric distance: q . (centroid + residual) via per-sub-space lookup tables
+        m, _, dsub = self.codebooks.shape
+        lookup = np.einsum("jcd,jd->jc", self.codebooks, query.reshape(m, dsub))
+        approx = list_scores + lookup[np.arange(m), self.codes[positions]].sum(axis=1)
+
+        candidates = top_k_indices(approx, max(k, self.rescore))
+        labels = self.list_labels[positions[candidates]]
+        scores = approx[candidates]
+
+        # Exact re-score of the shortlist against the stored float vectors
+        if self.rescore:
+            vectors = np.stack([self.labels[label][0].vectors[self.labels[label][1]] for label in labels])
+            scores = vectors.astype(np.float32) @ query
+            order = np.argsort(-scores)
+            labels, scores = labels[order], scores[order]
+
+        return [self.labels[label][0].match(self.labels[label][1], score) for label, score in zip(labels[:k], scores[:k])]
@@ -0,0 +1,160 @@
+"""
+Solace - BM25 Lexical Index + Hybrid Fusion
+
+Local inverted index over chunk text (and references), built by the ingestion
+export (bm25.npz in each store dir) and loaded at startup. Keyword-heavy
+queries ("Psalm 23", "Dumbledore") get exact matches in microseconds; the
+lexical hits are merged with the dense candidates by reciprocal-rank fusion
+before the rerank step.
+
+The tokenizer settings (pattern, stopwords, plural folding) are read from
+bm25.npz so queries are tokenized exactly like the indexed texts.
+"""
+
+import os
+import re
+
+import numpy as np
+
+from local_index import LocalMatch
+
+# Standard RRF constant - dampens the weight of top ranks
+RRF_K = 60
+
+
+class BM25Segment:
+    """BM25 postings for one store segment (doc id == store row)"""
+
+    def __init__(self, segment, path: str):
+        with np.load(path) as data:
+            self.terms = {term: i for i, term in enumerate(data["terms"].tolist())}
+            self.indptr = data["indptr"]
+            self.doc_ids = data["doc_ids"]
+            self.tfs = data["tfs"].astype(np.float32)
+            self.doc_lengths = data["doc_lengths"].astype(np.float32)
+            self.k1 = float(data["k1"])
+            self.b = float(data["b"])
+            self.token_pattern = re.compile(str(data["token_pattern"]))
+            self.stopwords = set(data["stopwords"].tolist())
+            self.stem_plurals = bool(data["stem_plurals"]) if "stem_plurals" in data else False
+
+        if len(self.doc_lengths) != len(segment):
+            raise ValueError(f"BM25 index at {path} has {len(self.doc_lengths)} docs, store has {len(segment)}")
+
+        self.segment = segment
+        self.avg_doc_length = float(self.doc_lengths.mean()) if len(self.doc_lengths) else 0.0
+        self.length_norm = self.k1 * (1 - self.b + self.b * self.doc_lengths / (self.avg_doc_length or 1.0))
+
+    def tokenize(self, text: str):
+        tokens = [token for token in self.token_pattern.findall(text.lower()) if token not in self.stopwords]
+        if self.stem_plurals:
+            tokens = [
+                token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+                for token in tokens
+            ]
+        return tokens
+
+    def score(self, tokens):
+        """BM25 score for every doc in the segment"""
+        scores = np.zeros(len(self.doc_lengths), dtype=np.float32)
+        n_docs = len(self.doc_lengths)
+
+        for token in set(tokens):
+            term_id = self.terms.get(token)
+            if term_id is None:
+                continue
+
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            docs = self.doc_ids[start:end]
+            tfs = self.tfs[start:end]
+            idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + self.length_norm[docs])
+
+        return scores
+
+
+class LexicalIndex:
+    """BM25 search over every store segment that has a bm25.npz"""
+
+    def __init__(self, segments):
+        self.segments = segments
+
+    @classmethod
+    def load(cls, local_index, store_dirs):
+        segments = []
+        for segment, store_dir in zip(local_index.segments, store_dirs):
+            path = os.path.join(store_dir, "bm25.npz")
+            if os.path.exists(path):
+                segments.append(BM25Segment(segment, path))
+            else:
+                print(f"   ⚠️  No BM25 index in {store_dir} - re-run the ingestion export to enable lexical search")
+        return cls(segments)
+
+    def __len__(self):
+        return sum(len(segment.doc_lengths) for segment in self.segments)
+
+    def search(self, query: str, k: int, testament_filter: list = None):
+        """Top-k BM25 hits as LocalMatch objects (scores normalized to 0-1 by the best hit)"""
+        hits = []
+        for segment in self.segments:
+            tokens = segment.tokenize(query)
+            if not tokens:
+                continue
+
+            scores = segment.score(tokens)
+            for testament, start, end in segment.segment.partitions:
+                if testament_filter and testament not in testament_filter:
+                    continue
+
+                partition_scores = scores[start:end]
+                top = np.argsort(-partition_scores)[:k]
+                hits.extend(
+                    (float(partition_scores[row]), segment.segment, start + int(row))
+                    for row in top if partition_scores[row] > 0
+                )
+
+        hits.sort(key=lambda hit: hit[0], reverse=True)
+        hits = hits[:k]
+        if not hits:
+            return []
+
+        best = hits[0][0]
+        return [store.match(row, score / best) for score, store, row in hits]
+
+
+def match_id(match):
+    return getattr(match, '_id', getattr(match, 'id', None))
+
+
+def match_score(match) -> float:
+    return float(getattr(match, '_score', getattr(match, 'score', 0)) or 0)
+
+
+def reciprocal_rank_fusion(result_lists, top_n: int, rrf_k: int = RRF_K):
+    """Merge ranked match lists by RRF; the first list's match object wins on duplicates
+
+    The lists' own scores aren't comparable (dense cosine vs max-normalized
+    BM25), so every fused match carries its RRF score instead, rescaled so the
+    best fused hit gets the first list's top score. Downstream score gaps
+    (prefilter) and displayed scores then stay on the dense scale.
+    """
+    fused_scores = {}
+    matches = {}
+
+    for results in result_lists:
+        for rank, match in enumerate(results):
+            key = match_id(match)
+            fused_scores[key] = fused_scores.get(key, 0.0) + 1.0 / (rrf_k + rank + 1)
+            matches.setdefault(key, match)
+
+    ranked = sorted(fused_scores, key=fused_scores.get, reverse=True)[:top_n]
+    if not ranked:
+        return []
+
+    first = next((results for results in result_lists if results), [])
+    top_score = match_score(first[0]) if first else 1.0
+    scale = (top_score or 1.0) / fused_scores[ranked[0]]
+    return [
+        LocalMatch(key, fused_scores[key] * scale, getattr(matches[key], 'fields', {}))
+        for key in ranked
+    ]
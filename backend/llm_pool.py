@@ -0,0 +1,208 @@
+"""
+Solace - LLM Pool with Latency-aware Routing
+
+A single free-tier model means its queueing delay is our time-to-first-token.
+LLMPool holds several routes (provider + model, each an OpenAI-compatible
+client) and keeps a rolling EWMA of each route's time-to-first-token and
+tokens/second:
+
+- routes are tried in order of expected latency (TTFT + a typical answer at
+  the route's tokens/second); unmeasured routes go first so they get measured,
+  and a small `explore` share of requests tries a random route first so stale
+  estimates refresh
+- if a route's first token doesn't arrive within `first_token_timeout` (or it
+  errors before streaming), the pool fails over to the next route; the failed
+  route is charged a TTFT of twice the deadline so it sinks in the order
+- the last route has no failover deadline - the request's latency budget
+  decides when to give up
+
+Tokens/second counts content chunks, which for OpenAI-style streams is
+roughly one token each.
+"""
+
+import asyncio
+import random
+import time
+
+EWMA_ALPHA = 0.3
+EXPECTED_TOKENS = 400  # Typical explanation length, for ranking routes by total latency
+
+
+def parse_routes(spec: str) -> list:
+    """'provider=model,provider=model' -> [(provider, model), ...] (model names may contain ':')"""
+    routes = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        provider, _, model = item.partition("=")
+        if not model:
+            raise ValueError(f"LLM route '{item}' must be provider=model")
+        routes.append((provider.strip(), model.strip()))
+    return routes
+
+
+def _content(chunk):
+    return chunk.choices[0].delta.content if chunk.choices else None
+
+
+class Route:
+    """One provider + model with its rolling latency estimates"""
+
+    def __init__(self, provider: str, model: str, client):
+        self.provider = provider
+        self.model = model
+        self.client = client
+        self.name = f"{provider}/{model}"
+        self.ttft_ms = None
+        self.tokens_per_s = None
+        self.calls = 0
+        self.failures = 0
+
+    def _ewma(self, current, value, alpha):
+        return value if current is None else current + alpha * (value - current)
+
+    def observe_ttft(self, ms: float, alpha: float):
+        self.ttft_ms = self._ewma(self.ttft_ms, ms, alpha)
+
+    def observe_rate(self, tokens: int, seconds: float, alpha: float):
+        if tokens > 1 and seconds > 0:
+            self.tokens_per_s = self._ewma(self.tokens_per_s, tokens / seconds, alpha)
+
+    def expected_ms(self, default_tokens_per_s: float = None) -> float:
+        """TTFT + a typical answer (at `default_tokens_per_s` if this route's rate is unknown)"""
+        if self.ttft_ms is None:
+            return 0.0
+        tokens_per_s = self.tokens_per_s or default_tokens_per_s
+        generation_ms = EXPECTED_TOKENS / tokens_per_s * 1000 if tokens_per_s else 0.0
+        return self.ttft_ms + generation_ms
+
+
+class LLMPool:
+    """Routes streaming chat completions across models/providers"""
+
+    def __init__(self, routes: list, first_token_timeout: float = 4.0,
+                 alpha: float = EWMA_ALPHA, explore: float = 0.05):
+        if not routes:
+            raise ValueError("LLMPool needs at least one route")
+        self.routes = routes
+        self.first_token_timeout = first_token_timeout
+        self.alpha = alpha
+        self.explore = explore
+        self.failovers = 0
+
+    def _ranked(self) -> list:
+        # Routes without a measured rate are ranked at the pool's slowest known rate
+        rates = [route.tokens_per_s for route in self.routes if route.tokens_per_s]
+        default_rate = min(rates) if rates else None
+        return sorted(self.routes, key=lambda route: route.expected_ms(default_rate))
+
+    def order(self) -> list:
+        """Routes by expected latency (with an occasional random route first)"""
+        ranked = self._ranked()
+        if len(ranked) > 1 and random.random() < self.explore:
+            ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+        return ranked
+
+    async def _first_chunks(self, route: Route, create):
+        """Open the stream and read up to its first content chunk"""
+        stream = await create(route.client, route.model)
+        try:
+            chunks = []
+            iterator = stream.__aiter__()
+            async for chunk in iterator:
+                chunks.append(chunk)
+                if _content(chunk):
+                    return stream, iterator, chunks
+            raise RuntimeError("empty response")
+        except BaseException:
+            await _close(stream)
+            raise
+
+    async def open(self, create, routes: list = None):
+        """Fail over until a route streams its first token; the returned RouteStream yields the whole answer"""
+        routes = routes or self.order()
+        error = None
+        for i, route in enumerate(routes):
+            is_last = i == len(routes) - 1
+            route.calls += 1
+            start = time.perf_counter()
+            try:
+                stream, iterator, chunks = await asyncio.wait_for(
+                    self._first_chunks(route, create), None if is_last else self.first_token_timeout
+                )
+            except Exception as e:
+                route.failures += 1
+                route.observe_ttft(self.first_token_timeout * 2000, self.alpha)
+                error = e
+                if not is_last:
+                    self.failovers += 1
+                    reason = "no first token" if isinstance(e, asyncio.TimeoutError) else (str(e) or type(e).__name__)
+                    print(f"⚠️  LLM {route.name}: {reason} - failing over to {routes[i + 1].name}", flush=True)
+                continue
+
+            route.observe_ttft((time.perf_counter() - start) * 1000, self.alpha)
+            return RouteStream(self, route, stream, iterator, chunks, failovers=i)
+        raise error
+
+    async def stream(self, create, routes: list = None):
+        """Yield chunks of `create(client, model)` from the first route that starts streaming in time"""
+        response = await self.open(create, routes)
+        try:
+            async for chunk in response:
+                yield chunk
+        finally:
+            await response.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "failovers": self.failovers,
+            "routes": [
+                {
+                    "route": route.name,
+                    "ttft_ms": round(route.ttft_ms, 1) if route.ttft_ms is not None else None,
+                    "tokens_per_s": round(route.tokens_per_s, 1) if route.tokens_per_s is not None else None,
+                    "calls": route.calls,
+                    "failures": route.failures,
+                }
+                for route in self._ranked()
+            ],
+        }
+
+
+class RouteStream:
+    """Chunks of the route that won (buffered up to the first token, then live); `route` served it"""
+
+    def __init__(self, pool: LLMPool, route: Route, stream, iterator, chunks, failovers: int = 0):
+        self.pool = pool
+        self.route = route
+        self.failovers = failovers
+        self.stream = stream
+        self.iterator = iterator
+        self.chunks = chunks
+        self.first_token_at = time.perf_counter()
+        self.closed = False
+
+    async def __aiter__(self):
+        tokens = 0
+        try:
+            for chunk in self.chunks:
+                tokens += 1 if _content(chunk) else 0
+                yield chunk
+            async for chunk in self.iterator:
+                tokens += 1 if _content(chunk) else 0
+                yield chunk
+            self.route.observe_rate(tokens, time.perf_counter() - self.first_token_at, self.pool.alpha)
+        finally:
+            await self.aclose()
+
+    async def aclose(self):
+        if not self.closed:
+            self.closed = True
+            await _close(self.stream)
+
+
+async def _close(stream):
+    # Release the upstream HTTP stream
+    if hasattr(stream, "close"):
+        await stream.close()
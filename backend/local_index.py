@@ -0,0 +1,209 @@
+"""
+Solace - Local Vector Index
+
+In-process alternative to Pinecone search for our small corpus
+(~31k Bible verse chunks + ~6k Harry Potter passages).
+
+Each corpus is a store directory written by the ingestion scripts
+(data/local_store.py). Embeddings are opened with np.load(mmap_mode="r"), so
+they are zero-copy and paged in by the OS on demand instead of counting
+against the ~200MB RSS budget. Search is a blocked matrix-vector product +
+argpartition top-k.
+
+Rows are stored sorted by testament, so each testament (OT/NT/HP) is a
+contiguous slice of the matrix. Filtered searches only score the slices they
+need (a Jewish query scans the OT block, an HP query ~6k rows) and merge the
+per-partition top-k lists. Results use the same match shape as Pinecone hits
+(`_id`, `_score`, `fields`) so `format_results` and `rerank_results` work
+unchanged.
+
+Store layout:
+    store.json       - manifest (count, dimension, dtype, model)
+    embeddings.npy   - (N, D) L2-normalized chunk embeddings
+    texts.bin        - UTF-8 chunk texts, concatenated
+    metadata.jsonl   - one row per vector (id, reference, ..., text_offset, text_length)
+"""
+
+import heapq
+import itertools
+import json
+import os
+
+import numpy as np
+
+# Rows scored per block - bounds the float32 temp buffer for float16 stores
+SCORE_BLOCK_ROWS = 8192
+
+# Metadata fields exposed on each match (mirrors the Pinecone `fields` list)
+MATCH_FIELDS = ["reference", "book", "book_name", "testament", "translation"]
+
+
+class LocalMatch:
+    """Search hit with the same attributes as a Pinecone search hit"""
+
+    def __init__(self, match_id, score, fields):
+        self._id = match_id
+        self._score = score
+        self.fields = fields
+
+
+def normalize_rows(vectors):
+    """L2-normalize rows so that dot product == cosine similarity"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class StoreSegment:
+    """One corpus: embedding matrix + metadata rows + text blob"""
+
+    def __init__(self, vectors, metadata, texts):
+        if len(vectors) != len(metadata):
+            raise ValueError(f"{len(vectors)} vectors but {len(metadata)} metadata rows")
+
+        self.vectors = vectors
+        self.metadata = metadata
+        self.texts = texts
+        self.partitions = testament_partitions([m.get("testament", "") for m in metadata])
+
+    @classmethod
+    def open(cls, store_dir, dtype=None):
+        """Open a store directory; stays memory-mapped unless a dtype conversion is requested"""
+        vectors = np.load(os.path.join(store_dir, "embeddings.npy"), mmap_mode="r")
+        if dtype and np.dtype(dtype) != vectors.dtype:
+            vectors = np.ascontiguousarray(vectors, dtype=dtype)
+
+        with open(os.path.join(store_dir, "metadata.jsonl"), "r", encoding="utf-8") as f:
+            metadata = [json.loads(line) for line in f if line.strip()]
+
+        texts_path = os.path.join(store_dir, "texts.bin")
+        if os.path.getsize(texts_path) > 0:
+            texts = np.memmap(texts_path, dtype=np.uint8, mode="r")
+        else:
+            texts = np.zeros(0, dtype=np.uint8)
+
+        return cls(vectors, metadata, texts)
+
+    @classmethod
+    def from_arrays(cls, vectors, records, dtype="float32"):
+        """Build an in-memory segment from raw vectors and records with inline text"""
+        blob = bytearray()
+        metadata = []
+        for record in records:
+            text_bytes = record.get("text", "").encode("utf-8")
+            row = {key: value for key, value in record.items() if key != "text"}
+            row["text_offset"] = len(blob)
+            row["text_length"] = len(text_bytes)
+            blob.extend(text_bytes)
+            metadata.append(row)
+
+        vectors = np.ascontiguousarray(normalize_rows(vectors), dtype=dtype)
+        return cls(vectors, metadata, np.frombuffer(bytes(blob), dtype=np.uint8))
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    def text(self, row: int) -> str:
+        meta = self.metadata[row]
+        start = meta.get("text_offset", 0)
+        return bytes(self.texts[start:start + meta.get("text_length", 0)]).decode("utf-8")
+
+    def match(self, row: int, score):
+        meta = self.metadata[row]
+        fields = {field: meta.get(field, "") for field in MATCH_FIELDS}
+        fields["text"] = self.text(row)
+        return LocalMatch(meta.get("id", str(row)), float(score), fields)
+
+    def score(self, query_matrix, start: int = 0, end: int = None):
+        """Score rows [start, end) against a (Q, D) query batch -> (Q, end - start) similarities"""
+        end = len(self) if end is None else end
+        scores = np.empty((query_matrix.shape[0], end - start), dtype=np.float32)
+
+        for block_start in range(start, end, SCORE_BLOCK_ROWS):
+            block = self.vectors[block_start:min(block_start + SCORE_BLOCK_ROWS, end)]
+            offset = block_start - start
+            scores[:, offset:offset + len(block)] = query_matrix @ block.astype(np.float32, copy=False).T
+
+        return scores
+
+
+def testament_partitions(testaments):
+    """Contiguous (testament, start, end) runs over the row order"""
+    partitions = []
+    for testament, rows in itertools.groupby(enumerate(testaments), key=lambda row: row[1]):
+        rows = list(rows)
+        partitions.append((testament, rows[0][0], rows[-1][0] + 1))
+    return partitions
+
+
+def top_k_indices(scores, k: int):
+    """Indices of the k highest finite scores, best first"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # argpartition is O(N); only the k survivors get sorted
+    top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    top = top[np.argsort(-scores[top])]
+    return top[np.isfinite(scores[top])]
+
+
+class LocalIndex:
+    """Brute-force cosine index over one or more memory-mapped store segments"""
+
+    def __init__(self, segments):
+        self.segments = segments
+
+        dimensions = {segment.vectors.shape[1] for segment in segments}
+        if len(dimensions) != 1:
+            raise ValueError(f"Store segments have mismatched dimensions: {sorted(dimensions)}")
+        self.dimension = dimensions.pop()
+
+    @classmethod
+    def load(cls, store_dirs, dtype=None):
+        """Open one store segment per directory"""
+        return cls([StoreSegment.open(store_dir, dtype=dtype) for store_dir in store_dirs])
+
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments)
+
+    def search_batch(self, query_vectors, k: int, testament_filter: list = None):
+        """Top-k search for a batch of query vectors; returns one match list per query"""
+        query_matrix = normalize_rows(np.atleast_2d(query_vectors))
+        if query_matrix.shape[1] != self.dimension:
+            raise ValueError(f"Query dimension {query_matrix.shape[1]} != index dimension {self.dimension}")
+
+        # Partial top-k per matching partition, then merge the sorted lists
+        partials = [[] for _ in range(len(query_matrix))]
+        for segment in self.segments:
+            for testament, start, end in segment.partitions:
+                if testament_filter and testament not in testament_filter:
+                    continue
+
+                scores = segment.score(query_matrix, start, end)
+                for q, row_scores in enumerate(scores):
+                    partials[q].append([
+                        (float(row_scores[row]), segment, start + int(row))
+                        for row in top_k_indices(row_scores, k)
+                    ])
+
+        results = []
+        for query_partials in partials:
+            merged = heapq.merge(*query_partials, key=lambda c: c[0], reverse=True)
+            results.append([segment.match(row, score) for score, segment, row in itertools.islice(merged, k)])
+
+        return results
+
+    def rows_scanned(self, testament_filter: list = None) -> int:
+        """Number of vectors a search with this filter will score"""
+        return sum(
+            end - start
+            for segment in self.segments
+            for testament, start, end in segment.partitions
+            if not testament_filter or testament in testament_filter
+        )
+
+    def search(self, query_vector, k: int, testament_filter: list = None):
+        """Top-k search for a single query vector"""
+        return self.search_batch(query_vector, k, testament_filter)[0]
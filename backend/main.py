@@ -9,6 +9,10 @@ Ultra-lightweight: ~200MB memory (serverless embeddings via Pinecone)
 
 import os
 import re
+import json
+import time
+import asyncio
+import socket
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,15 +23,33 @@ os.environ["LANGCHAIN_TRACING_V2"] = "true" if os.getenv("LANGCHAIN_API_KEY") el
 os.environ["LANGCHAIN_API_KEY"] = os.getenv("LANGCHAIN_API_KEY", "")
 os.environ["LANGCHAIN_PROJECT"] = "solace"
 
-from langsmith import traceable
+from langsmith import traceable, get_current_run_tree
 from tavily import TavilyClient
 from pinecone import Pinecone
 from openai import AsyncOpenAI
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
+from local_index import LocalIndex
+from hnsw_index import HnswIndex
+from ivfpq_index import IvfPqIndex
+from int8_index import Int8Index
+from lexical import LexicalIndex, reciprocal_rank_fusion
+from references import ReferenceIndex, parse_reference, select_chunk_ids, fetched_matches, listed_ids
+from prefilter import prefilter_candidates
+from adaptive_k import LatencyModel, match_scores, plan_k
+from cache import LRUCache, normalize_issue
+from semantic_cache import SemanticCache
+from single_flight import SingleFlight
+from executors import BlockingPool, LoopLagMonitor
+from warmup import Warmer
+from speculation import SpeculativeGeneration, SpeculationStats
+from deadlines import BudgetStats
+from circuit_breaker import CircuitBreaker
+from hedging import Hedger
+from llm_pool import LLMPool, Route, parse_routes
 
 # Configuration
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY", "")
@@ -36,18 +58,95 @@ OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
 LLM_MODEL = "meta-llama/llama-3.3-70b-instruct:free"  # Good balance of speed & quality
 LLM_TEMPERATURE = 0.7
+LLM_POOL = os.getenv("LLM_POOL", f"openrouter={LLM_MODEL}")  # provider=model,... routed by TTFT and tokens/second
+LLM_FAILOVER_MS = int(os.getenv("LLM_FAILOVER_MS", "4000"))  # No first token in time -> next route in the pool
+LLM_PROVIDERS = {  # OpenAI-compatible endpoints; a provider's key is read from <PROVIDER>_API_KEY
+    "openrouter": "https://openrouter.ai/api/v1",
+    "groq": "https://api.groq.com/openai/v1",
+    "together": "https://api.together.xyz/v1",
+    "deepinfra": "https://api.deepinfra.com/v1/openai",
+    "openai": "https://api.openai.com/v1",
+}
 
 # Retrieval settings
 RETRIEVAL_K = 50  # Get top 50 candidates from Pinecone for better quality
 RETRIEVAL_N = 3   # Return top 3 to user
 USE_RERANKER = True  # Use Pinecone's hosted reranker 
+RERANK_BREAKER_FAILURE_RATE = float(os.getenv("RERANK_BREAKER_FAILURE_RATE", "0.5"))  # Share of failed/slow calls that opens it
+RERANK_BREAKER_SLOW_MS = int(os.getenv("RERANK_BREAKER_SLOW_MS", "1500"))  # Slower reranks count as failures
+RERANK_BREAKER_OPEN_SECONDS = int(os.getenv("RERANK_BREAKER_OPEN_SECONDS", "60"))  # Skip time before a probe
+PREFILTER_N = int(os.getenv("PREFILTER_N", "12"))  # Candidates sent to the reranker after local pre-filtering (0 = send all)
+HEDGE_SEARCH = os.getenv("HEDGE_SEARCH", "false").lower() == "true"  # Duplicate slow Pinecone searches, take the first answer
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))  # Search latency percentile to wait before hedging
+HEDGE_MAX_RATE = float(os.getenv("HEDGE_MAX_RATE", "0.1"))  # Max share of recent searches that may hedge
+HEDGE_WORKERS = int(os.getenv("HEDGE_WORKERS", "2"))  # Threads for hedge duplicates (no free thread = no hedge)
+ADAPTIVE_K = os.getenv("ADAPTIVE_K", "false").lower() == "true"  # Pick k (and whether to rerank) from the score distribution
+ADAPTIVE_K_PROBE = int(os.getenv("ADAPTIVE_K_PROBE", "10"))  # First, small search
+ADAPTIVE_K_MAX = int(os.getenv("ADAPTIVE_K_MAX", "100"))  # Depth used when the probe scores are flat
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1024"))  # Cached verse lists (0 = off)
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "3600"))  # Seconds
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+EMBED_QUERIES = os.getenv("EMBED_QUERIES", "true").lower() == "true"  # Embed explicitly and query Pinecone by vector
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "2048"))  # Cached query vectors (0 = off)
+SEMANTIC_CACHE = os.getenv("SEMANTIC_CACHE", "false").lower() == "true"  # Reuse verses for paraphrased concerns
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))  # Query vectors kept per tradition
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))  # Min cosine similarity for a hit
 
-# Initialize clients
-openai_client = AsyncOpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY
+# Local retrieval (in-process NumPy index instead of a Pinecone round trip)
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "pinecone")  # "pinecone", "local", "hnsw", "ivfpq" or "int8"
+LOCAL_INDEX_DIRS = os.getenv("LOCAL_INDEX_DIRS", "../data/store/bible,../data/store/harry_potter").split(",")
+LOCAL_INDEX_DTYPE = os.getenv("LOCAL_INDEX_DTYPE") or None  # None keeps the store memory-mapped; "float32" loads a copy
+EMBED_MODEL = "llama-text-embed-v2"  # Must match the model the index was built with
+HNSW_INDEX_DIR = os.getenv("HNSW_INDEX_DIR", "../data/store/hnsw")  # Built on first start if missing
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "64"))
+IVFPQ_INDEX_PATH = os.getenv("IVFPQ_INDEX_PATH", "../data/store/ivfpq.npz")  # Written by the store export (never built here)
+IVFPQ_NPROBE = int(os.getenv("IVFPQ_NPROBE", "16"))  # Inverted lists scanned per query
+IVFPQ_RESCORE = int(os.getenv("IVFPQ_RESCORE", "50"))  # Candidates re-scored exactly (0 = off)
+INT8_RERANK = int(os.getenv("INT8_RERANK", "50"))  # Int8 hits re-ranked with float scores (0 = off)
+HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "false").lower() == "true"  # Fuse BM25 hits with dense results (RRF)
+
+PINECONE_WORKERS = int(os.getenv("PINECONE_WORKERS", "16"))  # Threads for blocking Pinecone SDK calls
+RERANK_WORKERS = int(os.getenv("RERANK_WORKERS", "4"))  # Separate threads for reranks, so slow ones can't starve search
+PINECONE_POOL_SIZE = int(os.getenv("PINECONE_POOL_SIZE", str(PINECONE_WORKERS + RERANK_WORKERS + (HEDGE_WORKERS if HEDGE_SEARCH else 0))))  # Pooled keep-alive HTTP connections
+PINECONE_SHARED_CLIENT = os.getenv("PINECONE_SHARED_CLIENT", "true").lower() == "true"  # false = new client per rerank (A/B)
+TAVILY_WORKERS = int(os.getenv("TAVILY_WORKERS", "4"))  # Threads for blocking Tavily SDK calls
+WARM_TIMEOUT = float(os.getenv("WARM_TIMEOUT", "5"))  # Seconds per upstream warm-up probe
+WARM_INTERVAL = int(os.getenv("WARM_INTERVAL", "0"))  # Periodic keep-alive warm-up in seconds (0 = off)
+WARM_MAX_AGE = int(os.getenv("WARM_MAX_AGE", "60"))  # /healthz re-warms in the background when older than this
+STATS_REFRESH_INTERVAL = int(os.getenv("STATS_REFRESH_INTERVAL", "300"))  # Seconds between background describe_index_stats
+BUDGET_SEARCH_MS = int(os.getenv("BUDGET_SEARCH_MS", "3000"))  # Embed + search (0 = no stage deadline)
+BUDGET_RERANK_MS = int(os.getenv("BUDGET_RERANK_MS", "2000"))
+BUDGET_FIRST_TOKEN_MS = int(os.getenv("BUDGET_FIRST_TOKEN_MS", "10000"))  # Free-tier models can queue
+BUDGET_TOTAL_MS = int(os.getenv("BUDGET_TOTAL_MS", "45000"))  # End-to-end, caps every stage
+PROVISIONAL_VERSES = os.getenv("PROVISIONAL_VERSES", "true").lower() == "true"  # Send dense top-N before the rerank lands
+SPECULATIVE_LLM = os.getenv("SPECULATIVE_LLM", "false").lower() == "true"  # Start the LLM on dense top-N during rerank
+SINGLE_FLIGHT = os.getenv("SINGLE_FLIGHT", "true").lower() == "true"  # Coalesce identical concurrent requests
+EXPLANATION_CACHE_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", "512"))  # Cached explanations (0 = off)
+EXPLANATION_CACHE_TTL = int(os.getenv("EXPLANATION_CACHE_TTL", "86400"))  # Seconds
+EXPLANATION_CACHE_MAX_BYTES = int(os.getenv("EXPLANATION_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+EXPLANATION_REPLAY_CHARS = int(os.getenv("EXPLANATION_REPLAY_CHARS", "24"))  # Chars per replayed chunk
+EXPLANATION_REPLAY_DELAY_MS = int(os.getenv("EXPLANATION_REPLAY_DELAY_MS", "15"))  # 0 = replay in one frame
+
+# Shown when the LLM misses its first-token deadline and nothing is cached for the verses
+FALLBACK_EXPLANATION = (
+    "We couldn't write a reflection in time, but the passages above were chosen for what you're going through. "
+    "Take a moment with them, and feel free to ask again in a little while."
 )
 
+# Initialize clients (one per LLM provider in the pool)
+llm_clients = {}
+llm_routes = []
+for provider, model in parse_routes(LLM_POOL):
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(f"Unknown LLM provider '{provider}' (known: {', '.join(LLM_PROVIDERS)})")
+    if provider not in llm_clients:
+        llm_clients[provider] = AsyncOpenAI(
+            base_url=LLM_PROVIDERS[provider],
+            api_key=os.getenv(f"{provider.upper()}_API_KEY", "")
+        )
+    llm_routes.append(Route(provider, model, llm_clients[provider]))
+llm_pool = LLMPool(llm_routes, first_token_timeout=LLM_FAILOVER_MS / 1000)
+
 # Print startup info
 if os.getenv('LANGCHAIN_API_KEY'):
     print(f"✓ LangSmith tracing enabled")
@@ -55,6 +154,119 @@ if os.getenv('LANGCHAIN_API_KEY'):
 # Global state
 app_state = {}
 
+# Observed stage latencies (estimates the time adaptive k saves)
+search_latency = LatencyModel()
+rerank_latency = LatencyModel()
+
+# Final verse lists keyed by (normalized issue, tradition)
+result_cache = LRUCache(
+    RESULT_CACHE_SIZE,
+    ttl_seconds=RESULT_CACHE_TTL,
+    max_bytes=RESULT_CACHE_MAX_BYTES,
+    sizeof=lambda verses: sum(len(v.ref) + len(v.text) + len(v.translation) + len(v.url) + 64 for v in verses)
+)
+
+# Final cleaned explanations keyed by (normalized issue, tradition, sorted verse refs)
+explanation_cache = LRUCache(
+    EXPLANATION_CACHE_SIZE,
+    ttl_seconds=EXPLANATION_CACHE_TTL,
+    max_bytes=EXPLANATION_CACHE_MAX_BYTES,
+    sizeof=lambda text: len(text.encode("utf-8"))
+)
+
+# Blocking SDK calls run on bounded pools so they never stall the event loop
+pinecone_pool = BlockingPool("pinecone", PINECONE_WORKERS)
+# Reranks run without an SDK timeout, so one past its deadline keeps its thread until Pinecone answers - on its own pool
+rerank_pool = BlockingPool("pinecone-rerank", RERANK_WORKERS)
+tavily_pool = BlockingPool("tavily", TAVILY_WORKERS)
+loop_lag = LoopLagMonitor()
+warmer = Warmer(timeout=WARM_TIMEOUT)
+
+# Skips the hosted reranker while it keeps failing (e.g. over quota)
+rerank_breaker = CircuitBreaker(
+    "pinecone-rerank-v0",
+    failure_rate=RERANK_BREAKER_FAILURE_RATE,
+    slow_call_ms=RERANK_BREAKER_SLOW_MS,
+    open_seconds=RERANK_BREAKER_OPEN_SECONDS
+)
+
+# Hedged Pinecone searches (tail-latency control)
+# Searches carry an SDK timeout; duplicates also run on their own pool as a backstop
+hedge_pool = BlockingPool("pinecone-hedge", HEDGE_WORKERS)
+search_hedger = Hedger(
+    percentile=HEDGE_PERCENTILE,
+    max_rate=HEDGE_MAX_RATE,
+    can_hedge=lambda: hedge_pool.idle_workers() > 0
+)
+
+# Per-request latency budgets (overrun counters per stage)
+budget_stats = BudgetStats(
+    {"search": BUDGET_SEARCH_MS, "rerank": BUDGET_RERANK_MS, "first_token": BUDGET_FIRST_TOKEN_MS},
+    BUDGET_TOTAL_MS
+)
+
+# Speculative LLM starts (hit rate, time-to-first-token saved)
+speculation_stats = SpeculationStats()
+
+# Identical in-flight requests share one upstream stream
+single_flight = SingleFlight()
+
+# Last explanation per (tradition, sorted verse refs) - fallback when the first token is too slow
+explanation_by_verses = LRUCache(
+    EXPLANATION_CACHE_SIZE,
+    ttl_seconds=EXPLANATION_CACHE_TTL,
+    max_bytes=EXPLANATION_CACHE_MAX_BYTES,
+    sizeof=lambda text: len(text.encode("utf-8"))
+)
+
+# Query text -> embedding (shared by Pinecone, the semantic cache and local indexes)
+embedding_cache = LRUCache(EMBED_CACHE_SIZE)
+
+# Final verse lists keyed by query embedding (nearest previous concern per tradition)
+semantic_cache = SemanticCache(SEMANTIC_CACHE_SIZE, threshold=SEMANTIC_CACHE_THRESHOLD, ttl_seconds=RESULT_CACHE_TTL)
+
+
+def create_pinecone_client():
+    """Pinecone client whose HTTP pool has a keep-alive connection per executor worker"""
+    # The pool size is passed on to the Index and inference clients built from this one;
+    # the SDK already enables TCP keep-alive on its pooled sockets
+    try:
+        return Pinecone(api_key=PINECONE_API_KEY, connection_pool_maxsize=PINECONE_POOL_SIZE)
+    except TypeError:
+        print(f"⚠️  This Pinecone SDK doesn't accept connection_pool_maxsize - "
+              f"PINECONE_POOL_SIZE={PINECONE_POOL_SIZE} not applied (default pool size)", flush=True)
+        return Pinecone(api_key=PINECONE_API_KEY)
+
+
+async def refresh_index_stats(index, interval: int):
+    """Keep app_state["index_stats"] fresh in the background (health endpoints never call Pinecone)"""
+    while True:
+        try:
+            stats = await pinecone_pool.run(index.describe_index_stats)
+            first = "index_stats" not in app_state
+            app_state["index_stats"] = {"total_vector_count": stats.get('total_vector_count', 0), "refreshed_at": time.time()}
+            app_state["index_stats_error"] = None
+            if first:
+                print(f"   ✓ Index stats: {app_state['index_stats']['total_vector_count']:,} verses indexed", flush=True)
+        except Exception as e:
+            app_state["index_stats_error"] = str(e)
+            print(f"⚠️  Index stats refresh failed ({e})", flush=True)
+        await asyncio.sleep(interval)
+
+
+def index_stats_summary() -> dict:
+    """Cached index stats with their age (stale after two missed refreshes)"""
+    stats = app_state.get("index_stats")
+    if stats is None:
+        return {"db_verses": None, "stats_age_s": None, "stats_stale": True, "stats_error": app_state.get("index_stats_error")}
+    age = time.time() - stats["refreshed_at"]
+    return {
+        "db_verses": stats["total_vector_count"],
+        "stats_age_s": round(age, 1),
+        "stats_stale": age > 2 * STATS_REFRESH_INTERVAL,
+        "stats_error": app_state.get("index_stats_error"),
+    }
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -66,11 +278,47 @@ async def lifespan(app: FastAPI):
     
     # Initialize Pinecone
     print(f"📊 Connecting to Pinecone index: {PINECONE_INDEX_HOST}")
-    pc = Pinecone(api_key=PINECONE_API_KEY)
+    pc = create_pinecone_client()
     index = pc.Index(host=PINECONE_INDEX_HOST)
     
-    # Store in app state
+    # Store in app state (one long-lived inference client for embed + rerank)
+    app_state["pinecone_client"] = pc
     app_state["pinecone_index"] = index
+    app_state["inference_client"] = pc.inference
+    
+    # Load the local embedding store (local retrieval engines + lexical search)
+    if RETRIEVAL_BACKEND != "pinecone" or HYBRID_SEARCH:
+        local_store = LocalIndex.load(LOCAL_INDEX_DIRS, dtype=LOCAL_INDEX_DTYPE)
+        app_state["local_store"] = local_store
+        print(f"   ✓ Local store loaded: {len(local_store):,} chunks ({LOCAL_INDEX_DTYPE or 'memory-mapped'})")
+        
+        if RETRIEVAL_BACKEND == "local":
+            app_state["local_index"] = local_store
+        elif RETRIEVAL_BACKEND == "hnsw":
+            app_state["local_index"] = HnswIndex.load_or_build(local_store, HNSW_INDEX_DIR, ef_search=HNSW_EF_SEARCH)
+            print(f"   ✓ HNSW index ready (ef_search={HNSW_EF_SEARCH})")
+        elif RETRIEVAL_BACKEND == "ivfpq" and not os.path.exists(IVFPQ_INDEX_PATH):
+            # Training needs the whole float32 corpus in memory - never on the serving instance
+            app_state["local_index"] = local_store
+            print(f"   ⚠️  IVF-PQ index not found at {IVFPQ_INDEX_PATH} - using exact local search "
+                  f"(build it with the store export or bench_retrieval.py ivfpq --save)")
+        elif RETRIEVAL_BACKEND == "ivfpq":
+            ivfpq_index = IvfPqIndex.load(local_store, IVFPQ_INDEX_PATH, nprobe=IVFPQ_NPROBE, rescore=IVFPQ_RESCORE)
+            app_state["local_index"] = ivfpq_index
+            print(f"   ✓ IVF-PQ index ready ({ivfpq_index.nbytes / 1024 / 1024:.1f} MB, nprobe={IVFPQ_NPROBE}, rescore={IVFPQ_RESCORE})")
+        elif RETRIEVAL_BACKEND == "int8":
+            int8_index = Int8Index.load(local_store, LOCAL_INDEX_DIRS, rerank=INT8_RERANK)
+            app_state["local_index"] = int8_index
+            print(f"   ✓ Int8 index ready ({int8_index.nbytes / 1024 / 1024:.1f} MB, rerank={INT8_RERANK})")
+        
+        reference_index = ReferenceIndex(local_store)
+        app_state["reference_index"] = reference_index
+        print(f"   ✓ Reference index built: {len(reference_index):,} entries")
+        
+        if HYBRID_SEARCH:
+            lexical_index = LexicalIndex.load(local_store, LOCAL_INDEX_DIRS)
+            app_state["lexical_index"] = lexical_index
+            print(f"   ✓ BM25 index loaded: {len(lexical_index):,} chunks")
     
     # Initialize Tavily search tool
     if TAVILY_API_KEY:
@@ -80,16 +328,49 @@ async def lifespan(app: FastAPI):
     else:
         print(f"   ⚠️  Tavily API key not set - social media search disabled")
     
-    # Get stats
-    stats = index.describe_index_stats()
-    total_vectors = stats.get('total_vector_count', 0)
-    print(f"   ✓ Connected! {total_vectors:,} verses indexed")
+    # Pre-warm pooled connections to every configured upstream, in parallel
+    # (the index probe is a one-id fetch - describe_index_stats is slow and refreshed separately)
+    inference = app_state["inference_client"]
+    warmer.register("pinecone_index", lambda: pinecone_pool.run(index.fetch, ids=["warm-up"], namespace="__default__"))
+    warmer.register("pinecone_inference", lambda: pinecone_pool.run(
+        inference.embed, model=EMBED_MODEL, inputs=["warm up"], parameters={"input_type": "query", "truncate": "END"}
+    ))
+    for provider, client in llm_clients.items():
+        if os.getenv(f"{provider.upper()}_API_KEY"):
+            warmer.register(provider, client.models.list)
+    if TAVILY_API_KEY:
+        # TavilyClient opens a new connection per search, so only DNS can be warmed
+        warmer.register("tavily", lambda: tavily_pool.run(socket.getaddrinfo, "api.tavily.com", 443))
+    
+    async def warm_up():
+        # Startup doesn't wait on upstreams; /readyz turns 200 once the connections are warm
+        for name, entry in (await warmer.warm_all()).items():
+            status = "✓" if entry["warm"] else "⚠️ "
+            print(f"   {status} Warmed {name} in {entry['ms']:.0f}ms{'' if entry['warm'] else ' (' + entry['error'] + ')'}")
+        app_state["ready"] = True
+        print("✅ Ready to serve requests!\n")
+    
+    warm_task = asyncio.create_task(warm_up())
+    keep_alive_task = asyncio.create_task(warmer.keep_alive(WARM_INTERVAL)) if WARM_INTERVAL > 0 else None
     
-    print("✅ Ready to serve requests!\n")
+    # Index stats refresh in the background - not on the startup critical path
+    stats_task = asyncio.create_task(refresh_index_stats(index, STATS_REFRESH_INTERVAL))
+    
+    lag_task = asyncio.create_task(loop_lag.run())
     
     yield
     
     print("👋 Shutting down...")
+    app_state["ready"] = False
+    warm_task.cancel()
+    stats_task.cancel()
+    lag_task.cancel()
+    if keep_alive_task:
+        keep_alive_task.cancel()
+    pinecone_pool.shutdown()
+    rerank_pool.shutdown()
+    hedge_pool.shutdown()
+    tavily_pool.shutdown()
 
 
 app = FastAPI(
@@ -113,6 +394,7 @@ app.add_middleware(
 class RecommendRequest(BaseModel):
     issue: str
     tradition: str = "christian"  # "christian" or "jewish"
+    explanation_cache: bool = True  # False forces a fresh LLM generation
 
 
 class Verse(BaseModel):
@@ -128,34 +410,114 @@ class Verse(BaseModel):
         exclude_unset = False
 
 
+# Liveness: zero I/O, answers as long as the event loop does
+@app.get("/livez")
+async def liveness_check():
+    """Liveness probe"""
+    return {"ok": True}
+
+
+# Readiness: upstream connections warmed (the warm-up runs after startup, so the
+# server answers 503 here until it finishes); index stats come from the background refresh
+@app.get("/readyz")
+async def readiness_check():
+    """Readiness probe with cached index stats"""
+    ready = bool(app_state.get("ready"))
+    body = {"ready": ready, **index_stats_summary(), "upstreams": warmer.stats()}
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
 # Health check
 @app.get("/healthz")
 async def health_check():
-    """Health check endpoint"""
-    index = app_state.get("pinecone_index")
-    db_count = 0
-    if index:
-        try:
-            stats = index.describe_index_stats()
-            db_count = stats.get('total_vector_count', 0)
-        except:
-            pass
+    """Health check endpoint (no inline Pinecone calls - index stats are cached)"""
+    # Keep-warm pings also keep the upstream sockets hot, not just the process
+    if warmer.probes:
+        warmer.warm_in_background(WARM_MAX_AGE)
     
     return {
         "ok": True,
-        "db_verses": db_count,
+        **index_stats_summary(),
         "framework": "Pinecone + DeepSeek",
-        "reranker": "pinecone-rerank-v0" if USE_RERANKER else "none"
+        "reranker": "pinecone-rerank-v0" if USE_RERANKER else "none",
+        "reranker_breaker": rerank_breaker.stats() if USE_RERANKER else None,
+        "result_cache": result_cache.stats(),
+        "embedding_cache": embedding_cache.stats(),
+        "explanation_cache": explanation_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "executors": {
+            "pinecone": pinecone_pool.stats(),
+            "rerank": rerank_pool.stats(),
+            "hedge": hedge_pool.stats() if HEDGE_SEARCH else None,
+            "tavily": tavily_pool.stats()
+        },
+        "event_loop_lag": loop_lag.stats(),
+        "upstreams": warmer.stats(),
+        "speculation": speculation_stats.stats() if SPECULATIVE_LLM else None,
+        "deadlines": budget_stats.stats(),
+        "llm_pool": llm_pool.stats(),
+        "search_hedging": search_hedger.stats() if HEDGE_SEARCH else None,
+        "semantic_cache": semantic_cache.stats() if SEMANTIC_CACHE else None
     }
 
 
 # Helper functions
+async def open_llm_stream(create):
+    """Open the fastest LLM route, failing over inside the caller's trace span; records the route that served it"""
+    routes = llm_pool.order()
+    response = await llm_pool.open(create, routes)
+    run_tree = get_current_run_tree()
+    if run_tree is not None:
+        run_tree.add_metadata({
+            "llm_route": response.route.name,
+            "llm_routes_planned": [route.name for route in routes],
+            "llm_failovers": response.failovers,
+        })
+    return response
+
+
+def verses_event(event_type: str, verses) -> str:
+    """SSE frame carrying a verse list ("verses" or "verses_provisional")"""
+    data = {
+        "type": event_type,
+        "verses": [
+            {
+                "ref": v.ref,
+                "text": v.text,
+                "translation": v.translation,
+                "score": v.score,
+                "url": v.url
+            } for v in verses
+        ]
+    }
+    return f"data: {json.dumps(data)}\n\n"
+
+
+async def replay_explanation(text: str):
+    """Re-emit a cached explanation as explanation_chunk events (one frame when the delay is 0)"""
+    if EXPLANATION_REPLAY_DELAY_MS <= 0 or EXPLANATION_REPLAY_CHARS <= 0:
+        yield f"data: {json.dumps({'type': 'explanation_chunk', 'content': text})}\n\n"
+        return
+    
+    # Split after whitespace so words are never cut mid-chunk
+    chunk = ""
+    for word in re.findall(r"\S+\s*|\s+", text):
+        chunk += word
+        if len(chunk) >= EXPLANATION_REPLAY_CHARS:
+            yield f"data: {json.dumps({'type': 'explanation_chunk', 'content': chunk})}\n\n"
+            chunk = ""
+            await asyncio.sleep(EXPLANATION_REPLAY_DELAY_MS / 1000)
+    if chunk:
+        yield f"data: {json.dumps({'type': 'explanation_chunk', 'content': chunk})}\n\n"
+
+
 @traceable(run_type="tool", name="search_twitter")
 async def search_twitter_content(query: str, tavily_client):
     """Search Twitter for relevant comfort and encouragement posts"""
     try:
         # Use advanced search parameters for better tweet-specific results
-        response = tavily_client.search(
+        response = await tavily_pool.run(
+            tavily_client.search,
             query=query,
             include_raw_content="text",
             include_domains=["x.com"],
@@ -210,14 +572,47 @@ async def search_twitter_content(query: str, tavily_client):
         return []
 
 
-@traceable(run_type="retriever", name="search_pinecone")
-async def search_pinecone(index, query: str, k: int, testament_filter: list = None):
-    """Search Pinecone for relevant verses (integrated embedding)"""
-    # Pinecone automatically embeds the query text!
+@traceable(run_type="embedding", name="embed_query")
+def embed_query(query: str):
+    """Embed a query with Pinecone Inference (same model as the index), LRU-cached by text"""
+    key = query.strip()
+    vector = embedding_cache.get(key)
+    run_tree = get_current_run_tree()
+    if run_tree is not None:
+        run_tree.add_metadata({"embedding_cache_hit": vector is not None})
+    if vector is not None:
+        return vector
+    
+    embeddings = app_state["inference_client"].embed(
+        model=EMBED_MODEL,
+        inputs=[query],
+        parameters={"input_type": "query", "truncate": "END"}
+    )
+    embedding = embeddings.data[0]
+    vector = embedding.values if hasattr(embedding, 'values') else embedding['values']
+    embedding_cache.put(key, vector)
+    return vector
+
+
+def search_index(index, query: str, k: int, testament_filter: list = None, query_vector=None, timeout: float = None):
+    """One top-k search against the configured backend (by vector, or integrated embedding for Pinecone)
+
+    `timeout` (seconds) is passed to the SDK, so a search past its deadline frees its worker thread.
+    """
+    # Local backend: embed the query and search the in-process index
+    local_index = app_state.get("local_index")
+    if RETRIEVAL_BACKEND != "pinecone" and local_index is not None:
+        return local_index.search(query_vector if query_vector is not None else embed_query(query), k, testament_filter)
+    
+    # Query by vector when we already have one; otherwise Pinecone embeds the query text
+    if query_vector is not None:
+        query_input = {"vector": {"values": list(query_vector)}}
+    else:
+        query_input = {"inputs": {"text": query}}
     search_params = {
         "namespace": "__default__",
         "query": {
-            "inputs": {"text": query},
+            **query_input,
             "top_k": k
         },
         "fields": ["text", "reference", "book", "book_name", "testament", "translation"]
@@ -227,6 +622,8 @@ async def search_pinecone(index, query: str, k: int, testament_filter: list = No
     if testament_filter:
         search_params["query"]["filter"] = {"testament": {"$in": testament_filter}}
     
+    if timeout is not None:
+        search_params["timeout"] = timeout
     results = index.search(**search_params)
     
     # It's a Pydantic object - access attributes directly
@@ -241,10 +638,144 @@ async def search_pinecone(index, query: str, k: int, testament_filter: list = No
     return matches
 
 
+def plan_retrieval(matches, k: int):
+    """Adaptive k plan for a dense result list (same answer on the probe or the widened list)"""
+    return plan_k(match_scores(matches), RETRIEVAL_N, k, probe_k=ADAPTIVE_K_PROBE, max_k=ADAPTIVE_K_MAX)
+
+
+def rerank_size(k: int) -> int:
+    """Documents the reranker receives for k candidates"""
+    return min(PREFILTER_N, k) if PREFILTER_N else k
+
+
+def time_left(deadline):
+    """Seconds until a time.monotonic() deadline (None = unbounded)"""
+    return None if deadline is None else max(0.001, deadline - time.monotonic())
+
+
+async def run_search(index, query: str, k: int, testament_filter: list = None, query_vector=None, deadline=None):
+    """search_index on the Pinecone pool, hedged against slow responses when enabled
+
+    Each call gets the time left until `deadline` as its SDK timeout; the separate hedge
+    pool is only a backstop for calls the SDK timeout doesn't stop.
+    """
+    call = lambda: pinecone_pool.run(search_index, index, query, k, testament_filter, query_vector, time_left(deadline))
+    if HEDGE_SEARCH and RETRIEVAL_BACKEND == "pinecone":
+        hedge_call = lambda: hedge_pool.run(
+            search_index, index, query, k, testament_filter, query_vector, time_left(deadline)
+        )
+        return await search_hedger.run(call, hedge_call)
+    return await call()
+
+
+@traceable(run_type="retriever", name="search_pinecone")
+async def search_pinecone(index, query: str, k: int, testament_filter: list = None, adaptive: bool = False,
+                          query_vector=None, deadline=None):
+    """Search Pinecone for relevant verses; `adaptive` probes first and picks k from the scores"""
+    start = time.perf_counter()
+    if not adaptive:
+        matches = await run_search(index, query, k, testament_filter, query_vector, deadline)
+        search_latency.observe(k, (time.perf_counter() - start) * 1000)
+        return matches
+    
+    matches = await run_search(index, query, ADAPTIVE_K_PROBE, testament_filter, query_vector, deadline)
+    search_latency.observe(ADAPTIVE_K_PROBE, (time.perf_counter() - start) * 1000)
+    plan = plan_retrieval(matches, k)
+    
+    if plan.k > len(matches) and plan.mode != "exhausted":
+        widen_start = time.perf_counter()
+        matches = await run_search(index, query, plan.k, testament_filter, query_vector, deadline)
+        search_latency.observe(plan.k, (time.perf_counter() - widen_start) * 1000)
+    elif plan.k < len(matches):
+        matches = matches[:plan.k]
+    
+    # Estimated saving vs a fixed-k search + rerank (negative when the plan widened)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    fixed_search_ms = search_latency.estimate(k)
+    fixed_rerank_ms = rerank_latency.estimate(rerank_size(k)) if USE_RERANKER else 0.0
+    planned_rerank_ms = rerank_latency.estimate(rerank_size(plan.k)) if USE_RERANKER and plan.rerank else 0.0
+    saved_ms = None
+    if None not in (fixed_search_ms, fixed_rerank_ms, planned_rerank_ms):
+        saved_ms = round(fixed_search_ms - elapsed_ms + fixed_rerank_ms - planned_rerank_ms, 1)
+    
+    run_tree = get_current_run_tree()
+    if run_tree is not None:
+        run_tree.add_metadata({
+            "adaptive_k_mode": plan.mode,
+            "chosen_k": plan.k,
+            "default_k": k,
+            "rerank": plan.rerank,
+            "estimated_saved_ms": saved_ms,
+        })
+    
+    return matches
+
+
+@traceable(run_type="retriever", name="search_lexical")
+def search_lexical(lexical_index, query: str, k: int, testament_filter: list = None):
+    """BM25 search over the local store (exact keyword/reference matches)"""
+    return lexical_index.search(query, k, testament_filter)
+
+
+@traceable(run_type="retriever", name="lookup_reference")
+async def lookup_reference(index, reference, n: int, deadline=None):
+    """Fetch the chunks for a direct reference - no embedding, search or rerank"""
+    reference_index = app_state.get("reference_index")
+    if reference_index is not None:
+        return reference_index.lookup(reference, n)
+    
+    # No local store: list the chapter's chunk ids by prefix, then fetch the covering chunks
+    if reference.testament == "HP":
+        return []  # HP ids don't encode the book, so they can't be found by prefix
+    
+    def list_and_fetch():
+        chunk_ids = [
+            chunk_id
+            for page in index.list(
+                prefix=f"{reference.book}_{reference.chapter}_", namespace="__default__", timeout=time_left(deadline)
+            )
+            for chunk_id in listed_ids(page) if chunk_id
+        ]
+        selected = select_chunk_ids(chunk_ids, reference, n)
+        if not selected:
+            return []
+        return fetched_matches(
+            index.fetch(ids=selected, namespace="__default__", timeout=time_left(deadline)), selected
+        )
+    
+    return await pinecone_pool.run(list_and_fetch)
+
+
+@traceable(run_type="retriever", name="semantic_cache_lookup")
+def lookup_semantic_cache(tradition: str, query_vector):
+    """Verses of the nearest previously answered concern, if similar enough"""
+    verses, similarity, cached_issue = semantic_cache.get(tradition, query_vector)
+    run_tree = get_current_run_tree()
+    if run_tree is not None:
+        run_tree.add_metadata({
+            "semantic_cache_hit": verses is not None,
+            "similarity": round(similarity, 4),
+            "cached_issue": cached_issue,
+        })
+    return verses
+
+
+@traceable(run_type="tool", name="prefilter_candidates")
+def prefilter_for_rerank(query: str, matches, keep_n: int):
+    """Prune candidates locally (score gap, term overlap, book diversity) before the hosted rerank"""
+    return prefilter_candidates(query, matches, keep_n)
+
+
 @traceable(run_type="tool", name="rerank_results")
 def rerank_results(query: str, matches, top_n: int):
     """Rerank results using Pinecone's hosted reranker"""
-    pc = Pinecone(api_key=PINECONE_API_KEY)
+    setup_start = time.perf_counter()
+    inference = app_state.get("inference_client") if PINECONE_SHARED_CLIENT else None
+    client_mode = "shared"
+    if inference is None:
+        inference = Pinecone(api_key=PINECONE_API_KEY).inference
+        client_mode = "per_request"
+    setup_ms = (time.perf_counter() - setup_start) * 1000
     
     # Convert matches to documents for reranking
     documents = []
@@ -269,7 +800,8 @@ def rerank_results(query: str, matches, top_n: int):
         })
     
     # Call Pinecone's hosted reranker
-    reranked = pc.inference.rerank(
+    rerank_start = time.perf_counter()
+    reranked = inference.rerank(
         model="pinecone-rerank-v0",
         query=query,
         documents=documents,
@@ -278,6 +810,17 @@ def rerank_results(query: str, matches, top_n: int):
         return_documents=True,
         parameters={"truncate": "END"}
     )
+    rerank_ms = (time.perf_counter() - rerank_start) * 1000
+    
+    # Compare shared vs per-request clients in LangSmith (PINECONE_SHARED_CLIENT)
+    run_tree = get_current_run_tree()
+    if run_tree is not None:
+        run_tree.add_metadata({
+            "client": client_mode,
+            "client_setup_ms": round(setup_ms, 1),
+            "rerank_ms": round(rerank_ms, 1),
+            "documents": len(documents),
+        })
     
     # Convert reranked results back to match-like objects
     reranked_matches = []
@@ -535,13 +1078,13 @@ Here are the tweets:
 
 Write your response (2-4 paragraphs) using ONLY these tweets."""
                     
-                    # Stream from LLM
-                    return await openai_client.chat.completions.create(
+                    # Stream from the fastest LLM route (fails over if the first token is late)
+                    return await open_llm_stream(lambda client, model: client.chat.completions.create(
                         extra_headers={
                             "HTTP-Referer": "https://solace.app",
                             "X-Title": "Solace"
                         },
-                        model=LLM_MODEL,
+                        model=model,
                         messages=[
                             {"role": "system", "content": system_prompt},
                             {"role": "user", "content": user_prompt}
@@ -549,7 +1092,7 @@ Write your response (2-4 paragraphs) using ONLY these tweets."""
                         temperature=LLM_TEMPERATURE,
                         max_tokens=600,
                         stream=True
-                    )
+                    ))
                 
                 # Get the stream within traced context
                 stream = await create_social_llm_stream()
@@ -591,6 +1134,9 @@ Write your response (2-4 paragraphs) using ONLY these tweets."""
                 print(f"Error in social media stream: {e}", flush=True)
                 yield f"data: {json.dumps({'error': str(e)})}\n\n"
         
+        if SINGLE_FLIGHT:
+            flight_key = ("social_media", normalize_issue(request.issue))
+            return StreamingResponse(single_flight.stream(flight_key, generate_social_stream), media_type="text/event-stream")
         return StreamingResponse(generate_social_stream(), media_type="text/event-stream")
     
     # Determine testament filter for traditional sources
@@ -604,63 +1150,117 @@ Write your response (2-4 paragraphs) using ONLY these tweets."""
     
     # Wrap the entire streaming process in a traceable context
     @traceable(run_type="chain", name="recommend_verses_stream")
-    async def execute_recommendation():
-        # Step 1: Search Pinecone
-        matches = await search_pinecone(index, request.issue, RETRIEVAL_K, testament_filter)
+    async def execute_recommendation(on_dense=None):
+        # Fast path: the issue is just a reference ("John 14:27") - skip search + rerank
+        reference = parse_reference(request.issue)
+        if reference and (not testament_filter or reference.testament in testament_filter):
+            try:
+                matches = await lookup_reference(index, reference, RETRIEVAL_N, deadline=budget.deadline("total"))
+                if matches:
+                    return format_results(matches, RETRIEVAL_N, ensure_diversity=False), None
+            except Exception as e:
+                print(f"⚠️  Reference lookup failed ({e}), falling back to search", flush=True)
+        
+        # Step 1: Embed once - the vector feeds the semantic cache and the search
+        budget.begin("search")
+        query_vector = None
+        if EMBED_QUERIES or SEMANTIC_CACHE or RETRIEVAL_BACKEND != "pinecone":
+            try:
+                query_vector = await asyncio.wait_for(
+                    pinecone_pool.run(embed_query, request.issue), budget.timeout("search")
+                )
+            except Exception as e:
+                print(f"⚠️  Query embedding failed ({e!r}), falling back to integrated embedding", flush=True)
+        
+        # Semantic cache: reuse the verses of a recently answered paraphrase
+        if SEMANTIC_CACHE and query_vector is not None:
+            cached_verses = lookup_semantic_cache(request.tradition, query_vector)
+            if cached_verses is not None:
+                return cached_verses, None
+        
+        # Step 2: Search Pinecone
+        lexical_index = app_state.get("lexical_index")
+        try:
+            matches = await asyncio.wait_for(
+                search_pinecone(
+                    index, request.issue, RETRIEVAL_K, testament_filter, adaptive=ADAPTIVE_K, query_vector=query_vector,
+                    deadline=budget.deadline("search")
+                ),
+                budget.timeout("search")
+            )
+        except asyncio.TimeoutError:
+            budget.overrun("search")
+            if lexical_index is None:
+                return None, "Search is taking too long right now - please try again"
+            # Degrade to lexical hits only (no dense candidates to rerank)
+            lexical_matches = search_lexical(lexical_index, request.issue, RETRIEVAL_N, testament_filter)
+            if not lexical_matches:
+                return None, "Search is taking too long right now - please try again"
+            return format_results(lexical_matches, RETRIEVAL_N, ensure_diversity=True), None
+        plan = plan_retrieval(matches, RETRIEVAL_K) if ADAPTIVE_K else None
+        dense_matches = matches
+        
+        # Hybrid: fuse BM25 hits with the dense candidates (reciprocal-rank fusion)
+        if lexical_index is not None:
+            lexical_matches = search_lexical(lexical_index, request.issue, RETRIEVAL_K, testament_filter)
+            matches = reciprocal_rank_fusion([matches, lexical_matches], RETRIEVAL_K)
         
         if not matches:
             return None, "No verses found"
         
-        # Step 2: Rerank
-        if USE_RERANKER:
+        # Step 3: Rerank (adaptive k skips it when the dense scores are clearly peaked)
+        if plan is not None and not plan.rerank:
+            # The plan was made on the dense scores - serve that peak, not the fused list
+            verses = format_results(dense_matches or matches, RETRIEVAL_N, ensure_diversity=False)
+        elif USE_RERANKER and not rerank_breaker.allow():
+            # Reranker circuit open: skip it without paying for a failing round trip
+            budget.fallback("rerank")
+            verses = format_results(matches, RETRIEVAL_N, ensure_diversity=True)
+        elif USE_RERANKER:
+            # Dense candidates are usable now - lets the caller start work while the rerank runs
+            if on_dense is not None:
+                on_dense(matches)
             try:
-                matches = rerank_results(request.issue, matches, RETRIEVAL_N)
-                verses = format_results(matches, RETRIEVAL_N, ensure_diversity=False)
+                candidates = prefilter_for_rerank(request.issue, matches, PREFILTER_N) if PREFILTER_N else matches
+                rerank_start = time.perf_counter()
+                budget.begin("rerank")
+                reranked = await asyncio.wait_for(
+                    rerank_pool.run(rerank_results, request.issue, candidates, RETRIEVAL_N), budget.timeout("rerank")
+                )
+                rerank_ms = (time.perf_counter() - rerank_start) * 1000
+                rerank_latency.observe(len(candidates), rerank_ms)
+                rerank_breaker.record_success(rerank_ms)
+                verses = format_results(reranked, RETRIEVAL_N, ensure_diversity=False)
+            except asyncio.TimeoutError:
+                budget.overrun("rerank")
+                rerank_breaker.record_failure()
+                verses = format_results(matches, RETRIEVAL_N, ensure_diversity=True)
             except Exception as e:
                 print(f"⚠️  Reranker failed ({e}), falling back to diversity filter", flush=True)
+                rerank_breaker.record_failure()
+                budget.fallback("rerank")
                 verses = format_results(matches, RETRIEVAL_N, ensure_diversity=True)
         else:
             verses = format_results(matches, RETRIEVAL_N, ensure_diversity=True)
         
+        if SEMANTIC_CACHE and query_vector is not None and budget.cacheable:
+            semantic_cache.put(request.tradition, request.issue, query_vector, verses)
+        
         return verses, None
     
-    async def generate_stream():
-        try:
-            # Execute all retrieval steps within tracing context
-            verses, error = await execute_recommendation()
-            
-            if error:
-                yield f"data: {json.dumps({'error': error})}\n\n"
-                return
-            
-            # Send verses first
-            verses_data = {
-                "type": "verses",
-                "verses": [
-                    {
-                        "ref": v.ref,
-                        "text": v.text,
-                        "translation": v.translation,
-                        "score": v.score,
-                        "url": v.url
-                    } for v in verses
-                ]
-            }
-            yield f"data: {json.dumps(verses_data)}\n\n"
-            
-            # Step 3: Stream LLM explanation (wrapped in traceable context)
-            @traceable(run_type="llm", name="generate_explanation_stream")
-            async def create_llm_stream():
-                # Build prompt - format verses WITHOUT bold so LLM doesn't mimic that pattern
-                verses_text = "\n\n".join([
-                    f"{v.ref}{' (' + v.translation + ')' if v.translation != 'Original' else ''}: \"{v.text[:300]}...\""
-                    for v in verses
-                ])
-                verse_refs = ", ".join([v.ref for v in verses])
-                
-                # Get system prompt based on tradition
-                if request.tradition == "jewish":
-                    system_prompt = """You are a compassionate Jewish guide. Write 2-4 paragraphs of comfort and encouragement using ONLY the Torah/Tanakh verses provided.
+    # LLM explanation for a verse set (wrapped in traceable context)
+    @traceable(run_type="llm", name="generate_explanation_stream")
+    async def create_llm_stream(verses):
+        # Build prompt - format verses WITHOUT bold so LLM doesn't mimic that pattern
+        verses_text = "\n\n".join([
+            f"{v.ref}{' (' + v.translation + ')' if v.translation != 'Original' else ''}: \"{v.text[:300]}...\""
+            for v in verses
+        ])
+        verse_refs = ", ".join([v.ref for v in verses])
+        
+        # Get system prompt based on tradition
+        if request.tradition == "jewish":
+            system_prompt = """You are a compassionate Jewish guide. Write 2-4 paragraphs of comfort and encouragement using ONLY the Torah/Tanakh verses provided.
 
 CRITICAL RULES:
 - ONLY reference the specific verses provided below - DO NOT mention any other verses
@@ -675,8 +1275,8 @@ CRITICAL RULES:
 - FORMAT: Write in 2-4 separate paragraphs with blank lines between them
 
 Just write the encouragement directly using ONLY the provided verses."""
-                elif request.tradition == "harry_potter":
-                    system_prompt = """You are a compassionate guide who finds wisdom in stories. Write 2-4 paragraphs of comfort and encouragement using ONLY the Harry Potter passages provided.
+        elif request.tradition == "harry_potter":
+            system_prompt = """You are a compassionate guide who finds wisdom in stories. Write 2-4 paragraphs of comfort and encouragement using ONLY the Harry Potter passages provided.
 
 CRITICAL RULES:
 - ONLY reference the specific passages provided below - DO NOT mention any other scenes
@@ -691,8 +1291,8 @@ CRITICAL RULES:
 - FORMAT: Write in 2-4 separate paragraphs with blank lines between them
 
 Just write the encouragement directly, connecting the story's wisdom to their experience using ONLY the provided passages."""
-                else:  # christian
-                    system_prompt = """You are a compassionate, non-denominational Christian guide. Write 2-4 paragraphs of comfort and encouragement using ONLY the Bible verses provided.
+        else:  # christian
+            system_prompt = """You are a compassionate, non-denominational Christian guide. Write 2-4 paragraphs of comfort and encouragement using ONLY the Bible verses provided.
 
 CRITICAL RULES:
 - ONLY reference the specific verses provided below - DO NOT mention any other verses
@@ -706,8 +1306,8 @@ CRITICAL RULES:
 - FORMAT: Write in 2-4 separate paragraphs with blank lines between them
 
 Just write the encouragement directly using ONLY the provided verses."""
-                
-                user_prompt = f"""Person's concern: "{request.issue}"
+        
+        user_prompt = f"""Person's concern: "{request.issue}"
 
 The ONLY passages you may reference are: {verse_refs}
 
@@ -716,32 +1316,30 @@ Here are the passages:
 {verses_text}
 
 Write your response (2-4 paragraphs) using ONLY these passages."""
-                
-                # Stream from LLM
-                return await openai_client.chat.completions.create(
-                    extra_headers={
-                        "HTTP-Referer": "https://solace.app",
-                        "X-Title": "Solace"
-                    },
-                    model=LLM_MODEL,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=LLM_TEMPERATURE,
-                    max_tokens=600,
-                    stream=True
-                )
-            
-            # Get the stream within traced context
-            stream = await create_llm_stream()
-            
-            # Accumulate chunks for cleaning
-            full_text = ""
+        
+        # Stream from the fastest LLM route (fails over if the first token is late)
+        return await open_llm_stream(lambda client, model: client.chat.completions.create(
+            extra_headers={
+                "HTTP-Referer": "https://solace.app",
+                "X-Title": "Solace"
+            },
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=LLM_TEMPERATURE,
+            max_tokens=600,
+            stream=True
+        ))
+    
+    async def explanation_pieces(verses):
+        """Cleaned text pieces of a fresh LLM explanation for `verses`"""
+        stream = await create_llm_stream(verses)
+        try:
             async for chunk in stream:
                 if chunk.choices[0].delta.content:
                     content = chunk.choices[0].delta.content
-                    full_text += content
                     
                     # Clean content in real-time to remove special tokens
                     cleaned_content = content
@@ -760,19 +1358,140 @@ Write your response (2-4 paragraphs) using ONLY these passages."""
                     
                     # Only send if there's content after cleaning
                     if cleaned_content:
-                        data = {
-                            "type": "explanation_chunk",
-                            "content": cleaned_content
-                        }
-                        yield f"data: {json.dumps(data)}\n\n"
+                        yield cleaned_content
+        finally:
+            # Cancelled speculation: release the upstream HTTP stream
+            await stream.aclose()
+    
+    cache_key = (normalize_issue(request.issue), request.tradition)
+    budget = budget_stats.budget()
+    
+    async def generate_stream():
+        """SSE events, in this order:
+        
+        1. `verses_provisional` (optional, at most once): dense top-N right after search, only when a
+           rerank follows - the final set may differ
+        2. `verses` (exactly once): the final verses - they replace any provisional ones
+        3. `explanation_chunk` (zero or more): never sent before `verses`
+        4. `done`
+        
+        An `{"error": ...}` event can replace any step and ends the stream.
+        """
+        speculation = None
+        try:
+            # Cache hit: same concern + tradition answered recently - no upstream calls
+            verses = result_cache.get(cache_key)
+            if verses is None:
+                # Execute all retrieval steps within tracing context
+                dense_ready = asyncio.Queue()
+                retrieval = asyncio.create_task(execute_recommendation(on_dense=dense_ready.put_nowait))
+                
+                # Dense results arrive before the rerank: show them provisionally and/or
+                # start the LLM on them speculatively while the rerank runs
+                if PROVISIONAL_VERSES or SPECULATIVE_LLM:
+                    dense = asyncio.create_task(dense_ready.get())
+                    await asyncio.wait({retrieval, dense}, return_when=asyncio.FIRST_COMPLETED)
+                    if dense.done():
+                        provisional = format_results(dense.result(), RETRIEVAL_N, ensure_diversity=True)
+                        if PROVISIONAL_VERSES and provisional:
+                            yield verses_event("verses_provisional", provisional)
+                        if SPECULATIVE_LLM:
+                            speculation = SpeculativeGeneration([v.ref for v in provisional], explanation_pieces(provisional))
+                    else:
+                        dense.cancel()
+                
+                verses, error = await retrieval
+                
+                if error:
+                    yield f"data: {json.dumps({'error': error})}\n\n"
+                    return
+                if budget.cacheable:  # Degraded verse lists aren't worth caching
+                    result_cache.put(cache_key, verses)
             
-            # Send done signal
-            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+            # Send final verses first
+            yield verses_event("verses", verses)
+            
+            # Same concern, tradition and verses explained recently - replay instead of regenerating
+            explanation_key = (cache_key[0], request.tradition, tuple(sorted(v.ref for v in verses)))
+            cached_explanation = explanation_cache.get(explanation_key) if request.explanation_cache else None
+            if cached_explanation is not None:
+                if speculation is not None:
+                    speculation.cancel()
+                    speculation = None
+                async for event in replay_explanation(cached_explanation):
+                    yield event
+                yield f"data: {json.dumps({'type': 'done'})}\n\n"
+                return
+            
+            # Step 4: Stream the LLM explanation - the speculative one if it was started on the same verses
+            refs = [v.ref for v in verses]
+            llm_start = time.perf_counter()
+            if speculation is not None and speculation.matches(refs):
+                pieces = speculation.pieces()
+            else:
+                if speculation is not None:
+                    speculation.cancel()
+                    speculation_stats.record(hit=False)
+                    speculation = None
+                pieces = explanation_pieces(verses)
+            
+            budget.begin("first_token")
+            pieces = pieces.__aiter__()
+            full_text = ""
+            while True:
+                stage = "total" if full_text else "first_token"
+                try:
+                    content = await asyncio.wait_for(pieces.__anext__(), budget.timeout(stage))
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    budget.overrun(stage)
+                    if not full_text:
+                        # No first token in time: last explanation of the same verses, or a short note
+                        fallback = explanation_by_verses.get(explanation_key[1:]) or FALLBACK_EXPLANATION
+                        async for event in replay_explanation(fallback):
+                            yield event
+                    break
+                
+                if not full_text:
+                    if speculation is not None:
+                        # TTFT left after the final verses were ready (0 if the speculative stream was ahead)
+                        saved = speculation_stats.record(hit=True, ttft_after_verses_ms=(time.perf_counter() - llm_start) * 1000)
+                        if saved is not None:
+                            print(f"⚡ Speculative explanation reused, ~{saved:.0f}ms time-to-first-token saved", flush=True)
+                    else:
+                        speculation_stats.observe_llm_ttft((time.perf_counter() - llm_start) * 1000)
+                full_text += content
+                data = {
+                    "type": "explanation_chunk",
+                    "content": content
+                }
+                yield f"data: {json.dumps(data)}\n\n"
+            
+            # Only complete generations are cached
+            final_text = clean_llm_output(full_text)
+            if final_text and not {"first_token", "total"} & set(budget.overruns):
+                explanation_by_verses.put(explanation_key[1:], final_text)
+                if request.explanation_cache:
+                    explanation_cache.put(explanation_key, final_text)
+            
+            # Send done signal (with the stages that blew their deadline or fell back, if any)
+            done = {'type': 'done'}
+            if budget.degraded:
+                done['degraded'] = budget.degraded
+            yield f"data: {json.dumps(done)}\n\n"
             
         except Exception as e:
             print(f"Error in stream: {e}", flush=True)
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        finally:
+            if speculation is not None:
+                speculation.cancel()
     
+    # Identical concurrent requests attach to one retrieval + generation stream
+    if SINGLE_FLIGHT:
+        flight_key = (cache_key, request.explanation_cache)
+        return StreamingResponse(single_flight.stream(flight_key, generate_stream), media_type="text/event-stream")
     return StreamingResponse(generate_stream(), media_type="text/event-stream")
 
 
@@ -788,6 +1507,8 @@ async def root():
         "features": ["Streaming responses", "Real-time LLM generation", "Book diversity filtering"],
         "endpoints": {
             "health": "/healthz",
+            "liveness": "/livez",
+            "readiness": "/readyz",
             "recommend": "POST /recommend/stream (streaming SSE)",
             "docs": "/docs"
         }
@@ -0,0 +1,84 @@
+"""
+Solace - Local Rerank Pre-filter
+
+Cheap second stage between vector search and the hosted reranker.
+`rerank_results` cost and latency scale with the number and size of the
+documents sent, so the RETRIEVAL_K=50 candidates are pruned locally to
+~10-15 first, using:
+
+- dense score gap: candidates far below the best dense score are dropped
+- term overlap: bonus for candidates sharing content words with the query
+- book diversity: at most `max_per_book` candidates from the same book, so
+  the reranker still sees variety (the final 3 rarely come from one book)
+"""
+
+import re
+
+DEFAULT_MAX_SCORE_GAP = 0.15  # Dense cosine points below the best candidate
+DEFAULT_MAX_PER_BOOK = 3
+DEFAULT_OVERLAP_WEIGHT = 0.3  # Share of the ranking score that comes from term overlap
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+def content_words(text: str):
+    """Lowercased words of 4+ letters, crude plural folding (no stopword list needed)"""
+    return {
+        word[:-1] if word.endswith("s") and not word.endswith("ss") else word
+        for word in WORD_PATTERN.findall(text.lower()) if len(word) > 3
+    }
+
+
+def _fields(match):
+    fields = getattr(match, 'fields', {})
+    if hasattr(fields, '__dict__'):
+        return fields.__dict__
+    if isinstance(fields, dict):
+        return fields
+    return {}
+
+
+def prefilter_candidates(query: str, matches, keep_n: int,
+                         max_score_gap: float = DEFAULT_MAX_SCORE_GAP,
+                         max_per_book: int = DEFAULT_MAX_PER_BOOK,
+                         overlap_weight: float = DEFAULT_OVERLAP_WEIGHT):
+    """Prune dense candidates to `keep_n` before the hosted rerank"""
+    matches = list(matches)
+    if len(matches) <= keep_n:
+        return matches
+
+    query_words = content_words(query)
+    scores = [float(getattr(match, '_score', getattr(match, 'score', 0)) or 0) for match in matches]
+    best, worst = max(scores), min(scores)
+    spread = (best - worst) or 1.0
+
+    ranked = []
+    for position, (match, score) in enumerate(zip(matches, scores)):
+        fields = _fields(match)
+        overlap = len(query_words & content_words(fields.get('text', ''))) / len(query_words) if query_words else 0.0
+        combined = (1 - overlap_weight) * (score - worst) / spread + overlap_weight * overlap
+        within_gap = score >= best - max_score_gap
+        ranked.append((within_gap, combined, -position, match, fields.get('book_name', '')))
+
+    # Candidates inside the score gap first, then by combined score (ties keep search order)
+    ranked.sort(key=lambda row: (row[0], row[1], row[2]), reverse=True)
+
+    # First pass: respect the per-book cap; second pass: fill any remaining slots
+    selected = []
+    per_book = {}
+    for _, _, _, match, book in ranked:
+        if len(selected) >= keep_n:
+            break
+        if per_book.get(book, 0) < max_per_book:
+            selected.append(match)
+            per_book[book] = per_book.get(book, 0) + 1
+
+    if len(selected) < keep_n:
+        chosen = {id(match) for match in selected}
+        for _, _, _, match, _ in ranked:
+            if len(selected) >= keep_n:
+                break
+            if id(match) not in chosen:
+                selected.append(match)
+
+    return selected
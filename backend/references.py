@@ -0,0 +1,217 @@
+"""
+Solace - Direct Reference Lookup
+
+Fast path for issues that are just a reference ("John 14:27",
+"Psalm 55:22-23", "Deathly Hallows chapter 33"). These skip the embedding,
+vector search and hosted rerank entirely.
+
+- parse_reference() turns the raw issue into a Reference (or None)
+- ReferenceIndex maps (book, chapter, verse) -> chunk in O(1), built from the
+  local store metadata and the chunk ids the ingestion scripts emit
+  (`{book}_{chapter}_{start}_{end}` for the Bible)
+- select_chunk_ids() picks the right Bible chunk ids from a Pinecone id
+  listing when no local store is loaded
+"""
+
+import re
+
+from local_index import LocalMatch
+
+# Mirrors BOOK_NAMES in data/embed_bible_pinecone.py
+BOOK_NAMES = {
+    "GEN": "Genesis", "EXO": "Exodus", "LEV": "Leviticus", "NUM": "Numbers", "DEU": "Deuteronomy",
+    "JOS": "Joshua", "JDG": "Judges", "RUT": "Ruth", "1SA": "1 Samuel", "2SA": "2 Samuel",
+    "1KI": "1 Kings", "2KI": "2 Kings", "1CH": "1 Chronicles", "2CH": "2 Chronicles",
+    "EZR": "Ezra", "NEH": "Nehemiah", "EST": "Esther", "JOB": "Job", "PSA": "Psalms",
+    "PRO": "Proverbs", "ECC": "Ecclesiastes", "SNG": "Song of Solomon", "ISA": "Isaiah",
+    "JER": "Jeremiah", "LAM": "Lamentations", "EZK": "Ezekiel", "DAN": "Daniel",
+    "HOS": "Hosea", "JOL": "Joel", "AMO": "Amos", "OBA": "Obadiah", "JON": "Jonah",
+    "MIC": "Micah", "NAM": "Nahum", "HAB": "Habakkuk", "ZEP": "Zephaniah", "HAG": "Haggai",
+    "ZEC": "Zechariah", "MAL": "Malachi",
+    "MAT": "Matthew", "MRK": "Mark", "LUK": "Luke", "JHN": "John", "ACT": "Acts",
+    "ROM": "Romans", "1CO": "1 Corinthians", "2CO": "2 Corinthians", "GAL": "Galatians",
+    "EPH": "Ephesians", "PHP": "Philippians", "COL": "Colossians", "1TH": "1 Thessalonians",
+    "2TH": "2 Thessalonians", "1TI": "1 Timothy", "2TI": "2 Timothy", "TIT": "Titus",
+    "PHM": "Philemon", "HEB": "Hebrews", "JAS": "James", "1PE": "1 Peter", "2PE": "2 Peter",
+    "1JN": "1 John", "2JN": "2 John", "3JN": "3 John", "JUD": "Jude", "REV": "Revelation"
+}
+
+# Common short forms people type (numbered books get their "1 "/"2 " prefix added)
+BOOK_ALIASES = {
+    "gen": "GEN", "ex": "EXO", "exod": "EXO", "lev": "LEV", "num": "NUM", "deut": "DEU",
+    "josh": "JOS", "judg": "JDG", "psalm": "PSA", "ps": "PSA", "psa": "PSA", "prov": "PRO",
+    "eccl": "ECC", "eccles": "ECC", "song": "SNG", "song of songs": "SNG", "isa": "ISA",
+    "jer": "JER", "lam": "LAM", "ezek": "EZK", "dan": "DAN", "hos": "HOS", "obad": "OBA",
+    "mic": "MIC", "nah": "NAM", "hab": "HAB", "zeph": "ZEP", "hag": "HAG", "zech": "ZEC",
+    "mal": "MAL", "matt": "MAT", "mt": "MAT", "mk": "MRK", "lk": "LUK", "jn": "JHN",
+    "rom": "ROM", "gal": "GAL", "eph": "EPH", "phil": "PHP", "col": "COL", "philem": "PHM",
+    "heb": "HEB", "jas": "JAS", "rev": "REV", "revelations": "REV",
+    "1 sam": "1SA", "2 sam": "2SA", "1 kgs": "1KI", "2 kgs": "2KI", "1 chr": "1CH", "2 chr": "2CH",
+    "1 cor": "1CO", "2 cor": "2CO", "1 thess": "1TH", "2 thess": "2TH", "1 tim": "1TI",
+    "2 tim": "2TI", "1 pet": "1PE", "2 pet": "2PE",
+}
+
+BOOK_LOOKUP = {
+    **{name.lower(): code for code, name in BOOK_NAMES.items()},
+    **{code.lower(): code for code in BOOK_NAMES},
+    **BOOK_ALIASES,
+}
+
+NEW_TESTAMENT_BOOKS = set(list(BOOK_NAMES)[39:])
+
+# Harry Potter book names as stored in `book_name` (see embed_harry_potter_pinecone.py)
+HP_BOOKS = {
+    "philosopher's stone": "Philosopher's Stone",
+    "sorcerer's stone": "Philosopher's Stone",
+    "chamber of secrets": "Chamber of Secrets",
+    "prisoner of azkaban": "Prisoner of Azkaban",
+    "goblet of fire": "Goblet of Fire",
+    "order of the phoenix": "Order of the Phoenix",
+    "half-blood prince": "Half Blood Prince",
+    "half blood prince": "Half Blood Prince",
+    "deathly hallows": "Deathly Hallows",
+}
+
+
+
+def hp_book_key(name: str) -> str:
+    """Letters only, so stored and parsed HP book names match despite hyphens/apostrophes"""
+    return re.sub(r"[^a-z]", "", name.lower())
+
+
+BIBLE_PATTERN = re.compile(
+    r"^(?P<book>(?:[1-3]\s*)?[a-z][a-z .]*?)\.?\s*,?\s*(?:chapter\s*)?(?P<chapter>\d+)"
+    r"(?:\s*:\s*(?P<start>\d+)(?:\s*[-–]\s*(?P<end>\d+))?)?$"
+)
+HP_PATTERN = re.compile(
+    r"^(?:harry potter and the\s+)?(?P<book>[a-z' -]+?)\s*,?\s*(?:chapter|chap\.?|ch\.?)\s*(?P<chapter>\d+)$"
+)
+
+
+class Reference:
+    """Parsed reference: Bible book code + chapter (+ verse range), or HP book + chapter"""
+
+    def __init__(self, book: str, chapter: int, verse_start: int = None, verse_end: int = None, testament: str = "OT"):
+        self.book = book
+        self.chapter = chapter
+        self.verse_start = verse_start
+        self.verse_end = verse_end if verse_end is not None else verse_start
+        self.testament = testament
+
+    def __repr__(self):
+        verses = f":{self.verse_start}-{self.verse_end}" if self.verse_start else ""
+        return f"Reference({self.book} {self.chapter}{verses}, {self.testament})"
+
+
+def parse_reference(text: str):
+    """Parse an issue that is only a reference; returns None for normal free-text concerns"""
+    text = re.sub(r"\s+", " ", text.strip().lower().replace("’", "'")).rstrip(".!?")
+
+    match = HP_PATTERN.match(text)
+    if match and match.group("book") in HP_BOOKS:
+        return Reference(HP_BOOKS[match.group("book")], int(match.group("chapter")), testament="HP")
+
+    match = BIBLE_PATTERN.match(text)
+    if not match:
+        return None
+
+    book = re.sub(r"^([1-3])\s*", r"\1 ", match.group("book").strip())
+    code = BOOK_LOOKUP.get(book)
+    if not code:
+        return None
+
+    start = int(match.group("start")) if match.group("start") else None
+    end = int(match.group("end")) if match.group("end") else None
+    if start and end and end < start:
+        return None
+
+    testament = "NT" if code in NEW_TESTAMENT_BOOKS else "OT"
+    return Reference(code, int(match.group("chapter")), start, end, testament)
+
+
+def parse_chunk_id(chunk_id: str):
+    """`{book}_{chapter}_{start}_{end}` -> (book, chapter, start, end), or None for non-Bible ids"""
+    parts = chunk_id.split("_")
+    if len(parts) != 4 or parts[0] not in BOOK_NAMES:
+        return None
+    try:
+        return parts[0], int(parts[1]), int(parts[2]), int(parts[3])
+    except ValueError:
+        return None
+
+
+def select_chunk_ids(chunk_ids, reference: Reference, limit: int):
+    """Chunk ids of one chapter that cover the reference's verse range (whole chapter: first `limit`)"""
+    chunks = sorted(
+        (parsed[2], parsed[3], chunk_id)
+        for chunk_id in chunk_ids
+        if (parsed := parse_chunk_id(chunk_id)) and parsed[:2] == (reference.book, reference.chapter)
+    )
+    if reference.verse_start is None:
+        return [chunk_id for _, _, chunk_id in chunks[:limit]]
+
+    return [
+        chunk_id for start, end, chunk_id in chunks
+        if start <= reference.verse_end and end >= reference.verse_start
+    ][:limit]
+
+
+class ReferenceIndex:
+    """O(1) reference -> chunk lookup over the local store"""
+
+    def __init__(self, local_index):
+        self.verses = {}    # (book code, chapter, verse) -> (segment, row)
+        self.chapters = {}  # (book code or hp_book_key(book name), chapter) -> [(segment, row), ...] in order
+
+        for segment in local_index.segments:
+            for row, meta in enumerate(segment.metadata):
+                parsed = parse_chunk_id(meta.get("id", ""))
+                if parsed:
+                    book, chapter, start, end = parsed
+                    for verse in range(start, end + 1):
+                        self.verses[(book, chapter, verse)] = (segment, row)
+                    self.chapters.setdefault((book, chapter), []).append((segment, row))
+                elif meta.get("testament") == "HP":
+                    chapter = re.sub(r"\D", "", str(meta.get("chapter", "")))
+                    if chapter:
+                        book = hp_book_key(meta.get("book_name", ""))
+                        self.chapters.setdefault((book, int(chapter)), []).append((segment, row))
+
+    def __len__(self):
+        return len(self.verses) + sum(len(rows) for rows in self.chapters.values())
+
+    def lookup(self, reference: Reference, limit: int):
+        """Chunks covering the reference as LocalMatch objects (score 1.0), in reading order"""
+        if reference.testament == "HP":
+            rows = self.chapters.get((hp_book_key(reference.book), reference.chapter), [])[:limit]
+        elif reference.verse_start is None:
+            rows = self.chapters.get((reference.book, reference.chapter), [])[:limit]
+        else:
+            rows = []
+            for verse in range(reference.verse_start, reference.verse_end + 1):
+                row = self.verses.get((reference.book, reference.chapter, verse))
+                if row and row not in rows:
+                    rows.append(row)
+                if len(rows) >= limit:
+                    break
+
+        return [segment.match(row, 1.0) for segment, row in rows]
+
+
+def listed_ids(page):
+    """Chunk ids of one `index.list()` page (a ListResponse with `.vectors`, or a plain list of ids)"""
+    items = getattr(page, 'vectors', page) or []
+    return [item if isinstance(item, str) else getattr(item, 'id', None) for item in items]
+
+
+def fetched_matches(fetch_response, chunk_ids):
+    """Pinecone fetch response -> LocalMatch objects in the requested order"""
+    vectors = getattr(fetch_response, 'vectors', None) or {}
+    matches = []
+    for chunk_id in chunk_ids:
+        vector = vectors.get(chunk_id)
+        if vector is None:
+            continue
+        metadata = getattr(vector, 'metadata', None) or {}
+        matches.append(LocalMatch(chunk_id, 1.0, dict(metadata)))
+    return matches
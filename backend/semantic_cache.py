@@ -0,0 +1,120 @@
+"""
+Solace - Semantic Result Cache
+
+Exact-key caching misses paraphrases ("worried about my job" vs "anxious
+about work"). This cache keeps the query embedding of every answered concern
+in a small per-tradition vector table and reuses the reranked verses of the
+nearest previous query when its cosine similarity clears `threshold`.
+
+Each table is a preallocated (max_entries x dim) float32 matrix, so a lookup
+is one matrix-vector product; the least recently used slot is overwritten
+when a table is full.
+"""
+
+import time
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.92
+
+
+class SemanticTable:
+    """Fixed-size vector table for one tradition"""
+
+    def __init__(self, max_entries: int, dimension: int):
+        self.vectors = np.zeros((max_entries, dimension), dtype=np.float32)
+        self.values = [None] * max_entries
+        self.issues = [""] * max_entries
+        self.expires_at = np.full(max_entries, np.inf)
+        self.last_used = np.zeros(max_entries, dtype=np.int64)
+        self.used = np.zeros(max_entries, dtype=bool)
+
+    def nearest(self, query, now: float):
+        """(slot, similarity) of the most similar live entry, or (None, 0.0)"""
+        live = self.used & (self.expires_at > now)
+        if not live.any():
+            return None, 0.0
+        similarities = self.vectors @ query
+        similarities[~live] = -np.inf
+        slot = int(np.argmax(similarities))
+        return slot, float(similarities[slot])
+
+
+class SemanticCache:
+    """Nearest-previous-query cache: tradition + query vector -> cached value"""
+
+    def __init__(self, max_entries: int, threshold: float = DEFAULT_THRESHOLD, ttl_seconds: float = None):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.tables = {}
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return sum(int(table.used.sum()) for table in self.tables.values())
+
+    @staticmethod
+    def _normalize(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _tick(self) -> int:
+        self.clock += 1
+        return self.clock
+
+    def get(self, tradition: str, vector):
+        """Cached value of the nearest previous query above the threshold -> (value, similarity, issue)"""
+        table = self.tables.get(tradition)
+        if table is None or self.max_entries <= 0:
+            self.misses += 1
+            return None, 0.0, None
+
+        slot, similarity = table.nearest(self._normalize(vector), time.monotonic())
+        if slot is None or similarity < self.threshold:
+            self.misses += 1
+            return None, similarity, None
+
+        table.last_used[slot] = self._tick()
+        self.hits += 1
+        return table.values[slot], similarity, table.issues[slot]
+
+    def put(self, tradition: str, issue: str, vector, value):
+        if self.max_entries <= 0:
+            return
+        vector = self._normalize(vector)
+        table = self.tables.get(tradition)
+        if table is None:
+            table = self.tables[tradition] = SemanticTable(self.max_entries, len(vector))
+
+        now = time.monotonic()
+        slot, similarity = table.nearest(vector, now)
+        if slot is None or similarity < self.threshold:
+            # New entry: a free (or expired) slot first, otherwise the least recently used one
+            free = np.flatnonzero(~table.used | (table.expires_at <= now))
+            if len(free):
+                slot = int(free[0])
+            else:
+                slot = int(np.argmin(table.last_used))
+                self.evictions += 1
+
+        table.vectors[slot] = vector
+        table.values[slot] = value
+        table.issues[slot] = issue
+        table.expires_at[slot] = now + self.ttl_seconds if self.ttl_seconds else np.inf
+        table.last_used[slot] = self._tick()
+        table.used[slot] = True
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "threshold": self.threshold,
+        }
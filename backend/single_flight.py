@@ -0,0 +1,100 @@
+"""
+Solace - Request Coalescing (single-flight)
+
+Bursts of identical concurrent requests (a post going viral) would each run
+their own search, rerank and LLM generation. With single-flight, the first
+request for a key starts one upstream SSE stream in a background task and
+every concurrent request with the same key subscribes to it:
+
+- every emitted event is kept, so a subscriber that joins late first gets
+  the already-emitted prefix, then follows live
+- the flight is removed from the registry when the stream ends, so the next
+  request after that goes through the caches as usual
+- a subscriber disconnecting doesn't cancel the upstream stream; the others
+  (and the caches it fills) still need it
+- if the upstream stream fails, every subscriber gets the events emitted so
+  far and then the same exception
+"""
+
+import asyncio
+
+
+class Flight:
+    """One upstream event stream shared by all of its subscribers"""
+
+    def __init__(self):
+        self.events = []
+        self.done = False
+        self.error = None
+        self.changed = asyncio.Condition()
+        self.task = None
+
+    async def run(self, source):
+        try:
+            async for event in source:
+                async with self.changed:
+                    self.events.append(event)
+                    self.changed.notify_all()
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            async with self.changed:
+                self.done = True
+                self.changed.notify_all()
+
+    async def follow(self):
+        """Emitted prefix first, then live events until the stream ends"""
+        position = 0
+        while True:
+            async with self.changed:
+                await self.changed.wait_for(lambda: self.done or position < len(self.events))
+                pending = self.events[position:]
+                finished = self.done
+            for event in pending:
+                yield event
+            position += len(pending)
+            if finished and position >= len(self.events):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class SingleFlight:
+    """Registry of in-flight streams keyed by request identity"""
+
+    def __init__(self):
+        self.flights = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self.flights)
+
+    def stream(self, key, source_factory):
+        """Attach to the in-flight stream for `key`, or start one from `source_factory()`"""
+        flight = self.flights.get(key)
+        if flight is None:
+            flight = Flight()
+            self.flights[key] = flight
+            self.started += 1
+            flight.task = asyncio.create_task(self._run(key, flight, source_factory()))
+        else:
+            self.coalesced += 1
+        return flight.follow()
+
+    async def _run(self, key, flight, source):
+        try:
+            await flight.run(source)
+        except Exception as e:
+            print(f"⚠️  Coalesced stream failed ({e})", flush=True)
+        finally:
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self.flights),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
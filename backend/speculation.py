@@ -0,0 +1,99 @@
+"""
+Solace - Speculative LLM Start
+
+Generation normally waits on search -> rerank -> format. In speculative mode
+the LLM explanation starts on the dense top-N as soon as search returns,
+while the hosted rerank runs. Its text pieces are buffered (nothing reaches
+the client before the final verses event):
+
+- rerank picks the same verses -> the buffered pieces are flushed and the
+  stream continues, the LLM's time-to-first-token is already paid
+- rerank picks different verses -> the speculative stream is cancelled and
+  a fresh one starts on the reranked set
+
+SpeculationStats tracks the hit rate and the time-to-first-token saved vs
+the average non-speculative LLM TTFT.
+"""
+
+import asyncio
+import time
+
+EWMA_ALPHA = 0.2
+
+_DONE = object()
+
+
+class SpeculativeGeneration:
+    """LLM pieces for a provisional verse set, generated in the background until claimed"""
+
+    def __init__(self, refs, pieces):
+        self.refs = set(refs)
+        self.started_at = time.perf_counter()
+        self.first_piece_at = None
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._pump(pieces))
+
+    async def _pump(self, pieces):
+        try:
+            async for piece in pieces:
+                if self.first_piece_at is None:
+                    self.first_piece_at = time.perf_counter()
+                self.queue.put_nowait(piece)
+        except Exception as e:
+            self.queue.put_nowait(e)
+        finally:
+            self.queue.put_nowait(_DONE)
+
+    def matches(self, refs) -> bool:
+        return self.refs == set(refs)
+
+    def cancel(self):
+        self.task.cancel()
+
+    async def pieces(self):
+        """Buffered pieces first, then live ones until the generation ends"""
+        while True:
+            item = await self.queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+class SpeculationStats:
+    """Hit rate and time-to-first-token saved by speculative starts"""
+
+    def __init__(self, alpha: float = EWMA_ALPHA):
+        self.alpha = alpha
+        self.attempts = 0
+        self.hits = 0
+        self.saved_ms_total = 0.0
+        self.llm_ttft_ms = None  # EWMA of non-speculative LLM time-to-first-token
+
+    def observe_llm_ttft(self, ttft_ms: float):
+        if self.llm_ttft_ms is None:
+            self.llm_ttft_ms = ttft_ms
+        else:
+            self.llm_ttft_ms += self.alpha * (ttft_ms - self.llm_ttft_ms)
+
+    def record(self, hit: bool, ttft_after_verses_ms: float = None):
+        """Count one speculation; for hits, saved = usual LLM TTFT - TTFT left after the verses were ready"""
+        self.attempts += 1
+        if not hit:
+            return None
+        self.hits += 1
+        if self.llm_ttft_ms is None or ttft_after_verses_ms is None:
+            return None
+        saved = max(0.0, self.llm_ttft_ms - ttft_after_verses_ms)
+        self.saved_ms_total += saved
+        return saved
+
+    def stats(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.attempts, 3) if self.attempts else 0.0,
+            "avg_ttft_saved_ms": round(self.saved_ms_total / self.hits, 1) if self.hits else 0.0,
+            "llm_ttft_ms": round(self.llm_ttft_ms, 1) if self.llm_ttft_ms is not None else None,
+        }
@@ -0,0 +1,71 @@
+import threading
+
+import cache
+from cache import LRUCache, normalize_issue
+
+
+def test_normalize_issue_folds_contractions_case_and_punctuation():
+    assert normalize_issue("I'm   anxious!") == normalize_issue("i am anxious") == "i am anxious"
+    assert normalize_issue("I’ve lost hope...") == "i have lost hope"
+
+
+def test_entries_expire_after_ttl(clock, monkeypatch):
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    lru = LRUCache(max_entries=4, ttl_seconds=60)
+    lru.put("a", 1)
+
+    clock.advance(59)
+    assert lru.get("a") == 1
+
+    clock.advance(2)
+    assert lru.get("a") is None
+    assert len(lru) == 0
+    assert lru.stats()["expirations"] == 1
+    assert lru.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    lru = LRUCache(max_entries=2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    lru.get("a")  # "b" is now the least recently used
+    lru.put("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1 and lru.get("c") == 3
+    assert lru.stats()["evictions"] == 1
+
+
+def test_byte_bound_evicts_and_rejects_oversized_values():
+    lru = LRUCache(max_entries=10, max_bytes=10, sizeof=len)
+    lru.put("a", "x" * 6)
+    lru.put("b", "y" * 6)  # 12 bytes > 10: "a" goes
+    lru.put("huge", "z" * 11)  # never fits
+
+    assert lru.get("a") is None
+    assert lru.get("b") == "y" * 6
+    assert lru.get("huge") is None
+    assert lru.stats()["bytes"] == 6
+
+
+def test_concurrent_get_and_put_from_worker_threads():
+    # embedding_cache is used from the Pinecone worker pool
+    lru = LRUCache(max_entries=8)
+    errors = []
+
+    def worker(offset):
+        for i in range(5000):
+            try:
+                lru.put((offset + i) % 13, i)
+                lru.get(i % 13)
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(lru) == 8
@@ -0,0 +1,84 @@
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+
+
+@pytest.fixture
+def breaker(clock, monkeypatch):
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return CircuitBreaker("rerank", failure_rate=0.5, slow_call_ms=1000, window=10, min_calls=4, open_seconds=30)
+
+
+def trip(breaker):
+    for _ in range(4):
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+def test_stays_closed_until_min_calls_then_opens_at_failure_rate(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED  # 3 calls < min_calls
+
+    breaker.record_success(100)
+    assert breaker.state == OPEN  # 3/4 failed
+    assert breaker.stats()["trips"] == 1
+
+
+def test_slow_successes_count_as_failures(breaker):
+    for _ in range(4):
+        breaker.record_success(1500)
+    assert breaker.state == OPEN
+
+
+def test_healthy_traffic_keeps_it_closed(breaker):
+    for _ in range(10):
+        breaker.record_success(200)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_open_skips_calls_until_open_seconds_pass(breaker, clock):
+    trip(breaker)
+    clock.advance(29)
+    assert not breaker.allow()
+    assert breaker.stats()["skipped"] == 1
+    assert breaker.stats()["open_for_s"] == pytest.approx(1.0)
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success(breaker, clock):
+    trip(breaker)
+    clock.advance(30)
+
+    assert breaker.allow()  # the probe
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # everyone else still skips
+
+    breaker.record_success(200)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens(breaker, clock):
+    trip(breaker)
+    clock.advance(30)
+    assert breaker.allow()
+
+    breaker.record_success(5000)  # too slow
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["trips"] == 2
+
+
+def test_probe_that_never_reports_back_expires(breaker, clock):
+    trip(breaker)
+    clock.advance(30)
+    assert breaker.allow()  # probe is cancelled and never records
+
+    clock.advance(10)
+    assert not breaker.allow()
+    clock.advance(20)
+    assert breaker.allow()  # a new probe
@@ -0,0 +1,80 @@
+import pytest
+
+import deadlines
+from deadlines import BudgetStats
+
+
+@pytest.fixture
+def budget_stats(clock, monkeypatch):
+    monkeypatch.setattr(deadlines.time, "monotonic", clock)
+    return BudgetStats({"search": 3000, "rerank": 2000, "first_token": 10000}, total_ms=4000)
+
+
+def test_stage_timeout_counts_down_from_begin(budget_stats, clock):
+    budget = budget_stats.budget()
+    budget.begin("search")
+    assert budget.timeout("search") == pytest.approx(3.0)
+
+    clock.advance(1.0)
+    assert budget.timeout("search") == pytest.approx(2.0)
+
+    clock.advance(5.0)
+    assert budget.timeout("search") == 0.0  # expired, never negative
+
+
+def test_stage_deadline_is_capped_by_what_is_left_of_the_total(budget_stats, clock):
+    budget = budget_stats.budget()
+    clock.advance(3.0)
+    budget.begin("rerank")  # 2s stage, but only 1s of the total left
+
+    assert budget.timeout("rerank") == pytest.approx(1.0)
+    assert budget.deadline("rerank") == budget.deadline("total")
+
+
+def test_unstarted_stage_starts_on_first_timeout(budget_stats, clock):
+    budget = budget_stats.budget()
+    clock.advance(0.5)
+    assert budget.timeout("first_token") == pytest.approx(3.5)  # total-capped, started now
+
+
+def test_overrun_is_counted_once_and_reported_as_total_when_the_total_ran_out(budget_stats, clock):
+    budget = budget_stats.budget()
+    budget.begin("search")
+    clock.advance(3.5)
+    assert budget.overrun("search") == "search"
+    assert budget.overrun("search") == "search"
+
+    budget.begin("rerank")  # capped by the total deadline
+    clock.advance(1.0)
+    assert budget.overrun("rerank") == "total"
+
+    assert budget.overruns == ["search", "total"]
+    assert budget_stats.stats()["overruns"] == {"search": 1, "rerank": 0, "first_token": 0, "total": 1}
+
+
+def test_unbounded_budget_has_no_timeouts(clock, monkeypatch):
+    monkeypatch.setattr(deadlines.time, "monotonic", clock)
+    budget = BudgetStats({}, total_ms=0).budget()
+    assert budget.timeout("search") is None
+    assert budget.deadline("total") is None
+
+
+def test_reranker_fallback_marks_the_request_degraded_and_uncacheable(budget_stats):
+    budget = budget_stats.budget()
+    assert budget.cacheable and budget.degraded == []
+
+    budget.fallback("rerank")  # circuit open or rerank error - no deadline involved
+    budget.fallback("rerank")
+    assert budget.degraded == ["rerank"]
+    assert not budget.cacheable
+    assert budget_stats.stats()["overruns"]["rerank"] == 0
+
+
+def test_overrun_and_fallback_of_the_same_stage_are_reported_once(budget_stats, clock):
+    budget = budget_stats.budget()
+    budget.begin("rerank")
+    clock.advance(2.5)
+    budget.overrun("rerank")
+    budget.fallback("rerank")
+    assert budget.degraded == ["rerank"]
+    assert not budget.cacheable
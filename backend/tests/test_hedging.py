@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from hedging import Hedger
+
+
+class FakeCall:
+    """Async call that takes `delays[i]` seconds on its i-th invocation and records cancellations"""
+
+    def __init__(self, *delays, error=None):
+        self.delays = list(delays)
+        self.error = error
+        self.started = 0
+        self.cancelled = []
+
+    async def __call__(self):
+        attempt = self.started
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delays[attempt])
+        except asyncio.CancelledError:
+            self.cancelled.append(attempt)
+            raise
+        if self.error is not None and attempt == 0:
+            raise self.error
+        return attempt
+
+
+def hedger(**kwargs):
+    # Fewer than MIN_SAMPLES latencies: the hedge delay is min_delay_ms * 10 = 20ms
+    return Hedger(min_delay_ms=2, max_rate=1.0, **kwargs)
+
+
+def test_fast_primary_is_not_hedged():
+    h = hedger()
+    call = FakeCall(0.001)
+    assert asyncio.run(h.run(call)) == 0
+    assert call.started == 1
+    assert h.stats()["hedges"] == 0
+
+
+def test_slow_primary_is_hedged_and_the_loser_cancelled():
+    async def scenario():
+        h = hedger()
+        call = FakeCall(0.5, 0.001)
+        result = await h.run(call)
+        await asyncio.sleep(0)  # let the cancellation land
+        return h, call, result
+
+    h, call, result = asyncio.run(scenario())
+    assert result == 1  # the hedge answered
+    assert call.cancelled == [0]
+    assert h.stats()["hedges"] == 1 and h.stats()["hedge_wins"] == 1
+
+
+def test_hedge_rate_is_capped():
+    async def scenario():
+        h = hedger()
+        h.max_rate = 0.5
+        for _ in range(4):
+            await h.run(FakeCall(0.03, 0.03))
+        return h.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["calls"] == 4
+    assert stats["hedges"] == 2  # 1st and 4th: the 2nd and 3rd would push the rate past 0.5
+
+
+def test_no_capacity_skips_the_hedge():
+    h = hedger(can_hedge=lambda: False)
+    call = FakeCall(0.03)
+    assert asyncio.run(h.run(call)) == 0
+    assert call.started == 1
+    assert h.stats()["skipped_no_capacity"] == 1
+
+
+def test_hedge_call_is_used_for_the_duplicate():
+    h = hedger()
+    primary = FakeCall(0.5)
+    duplicate = FakeCall(0.001)
+    assert asyncio.run(h.run(primary, hedge_call=duplicate)) == 0
+    assert primary.started == 1 and duplicate.started == 1
+
+
+def test_failed_call_loses_to_the_one_that_succeeds():
+    h = hedger()
+    call = FakeCall(0.03, 0.03, error=RuntimeError("primary failed"))
+    assert asyncio.run(h.run(call)) == 1
+
+
+def test_error_is_raised_when_every_call_fails():
+    async def failing():
+        await asyncio.sleep(0.03)
+        raise RuntimeError("down")
+
+    h = hedger()
+    with pytest.raises(RuntimeError, match="down"):
+        asyncio.run(h.run(failing))
+    assert h.stats()["hedges"] == 1
+
+
+def test_caller_timeout_cancels_primary_and_hedge():
+    async def scenario():
+        h = hedger()
+        call = FakeCall(1.0, 1.0)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(h.run(call), timeout=0.05)
+        await asyncio.sleep(0)
+        leftover = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        return call, leftover
+
+    call, leftover = asyncio.run(scenario())
+    assert call.started == 2
+    assert sorted(call.cancelled) == [0, 1]
+    assert leftover == []
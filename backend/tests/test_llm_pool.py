@@ -0,0 +1,169 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from llm_pool import LLMPool, Route, parse_routes
+
+
+def chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+class FakeStream:
+    """OpenAI-style async chunk stream: waits `first_delay` seconds, then yields `contents`"""
+
+    def __init__(self, contents, first_delay=0.0):
+        self.contents = contents
+        self.first_delay = first_delay
+        self.closed = False
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.first_delay)
+        for content in self.contents:
+            yield chunk(content)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    """Stands in for an OpenAI-compatible client; `create` fails with `error` or returns `stream`"""
+
+    def __init__(self, stream=None, error=None):
+        self.stream = stream
+        self.error = error
+        self.models = []
+
+
+async def create(client, model):
+    client.models.append(model)
+    if client.error is not None:
+        raise client.error
+    return client.stream
+
+
+def pool(*clients, first_token_timeout=0.05):
+    routes = [Route(f"p{i}", f"m{i}", client) for i, client in enumerate(clients)]
+    return LLMPool(routes, first_token_timeout=first_token_timeout, explore=0), routes
+
+
+async def read(response):
+    return [c.choices[0].delta.content async for c in response]
+
+
+def test_late_first_token_fails_over_to_the_next_route():
+    slow = FakeClient(FakeStream(["late"], first_delay=1.0))
+    fast = FakeClient(FakeStream(["Be ", "still"]))
+    llm, routes = pool(slow, fast)
+
+    async def scenario():
+        response = await llm.open(create, routes)
+        return response, await read(response)
+
+    response, text = asyncio.run(scenario())
+    assert text == ["Be ", "still"]
+    assert response.route is routes[1] and response.failovers == 1
+    assert llm.stats()["failovers"] == 1
+    assert routes[0].failures == 1 and routes[0].ttft_ms == pytest.approx(100.0)  # charged 2x the deadline
+    assert slow.stream.closed and fast.stream.closed
+
+
+def test_error_before_streaming_fails_over():
+    down = FakeClient(error=RuntimeError("503 from provider"))
+    up = FakeClient(FakeStream(["ok"]))
+    llm, routes = pool(down, up)
+
+    response = asyncio.run(llm.open(create, routes))
+    assert response.route is routes[1]
+    assert routes[0].failures == 1
+
+
+def test_empty_response_counts_as_a_failure():
+    empty = FakeClient(FakeStream([None, ""]))
+    up = FakeClient(FakeStream(["ok"]))
+    llm, routes = pool(empty, up)
+
+    response = asyncio.run(llm.open(create, routes))
+    assert response.route is routes[1]
+    assert empty.stream.closed
+
+
+def test_last_route_has_no_first_token_deadline():
+    slow = FakeClient(FakeStream(["finally"], first_delay=0.1))  # past the 0.05s failover deadline
+    llm, routes = pool(slow)
+
+    async def scenario():
+        return await read(await llm.open(create, routes))
+
+    assert asyncio.run(scenario()) == ["finally"]
+    assert llm.failovers == 0
+
+
+def test_last_route_error_is_raised():
+    llm, routes = pool(FakeClient(error=RuntimeError("a")), FakeClient(error=RuntimeError("b")))
+    with pytest.raises(RuntimeError, match="b"):
+        asyncio.run(llm.open(create, routes))
+
+
+def test_stream_yields_the_buffered_first_chunk_once_and_measures_the_route():
+    client = FakeClient(FakeStream([None, "a", "b", "c"]))
+    llm, routes = pool(client)
+
+    async def scenario():
+        return [c.choices[0].delta.content async for c in llm.stream(create, routes)]
+
+    assert asyncio.run(scenario()) == [None, "a", "b", "c"]
+    assert routes[0].calls == 1 and routes[0].ttft_ms is not None
+    assert client.stream.closed
+
+
+def test_closing_early_closes_the_upstream_stream():
+    client = FakeClient(FakeStream(["a", "b", "c"]))
+    llm, routes = pool(client)
+
+    async def scenario():
+        response = await llm.open(create, routes)
+        async for _ in response:
+            break
+        await response.aclose()
+        await response.aclose()  # idempotent
+        return response
+
+    response = asyncio.run(scenario())
+    assert response.closed and client.stream.closed
+
+
+def test_routes_are_ranked_by_expected_latency():
+    llm, routes = pool(FakeClient(), FakeClient(), FakeClient())
+    routes[0].ttft_ms, routes[0].tokens_per_s = 2000, 20  # 2s + 400 tokens in 20s
+    routes[1].ttft_ms, routes[1].tokens_per_s = 300, 40  # 0.3s + 10s
+    # routes[2] is unmeasured and goes first so it gets measured
+
+    assert llm.order() == [routes[2], routes[1], routes[0]]
+
+    # Measured TTFT but no rate yet: ranked at the slowest known rate, not as if it were instant
+    routes[2].ttft_ms = 200
+    assert llm.order() == [routes[1], routes[2], routes[0]]
+    routes[2].ttft_ms = 3000
+    assert llm.order() == [routes[1], routes[0], routes[2]]
+
+def test_ttft_estimate_is_an_ewma():
+    route = Route("p", "m", None)
+    route.observe_ttft(1000, alpha=0.3)
+    route.observe_ttft(2000, alpha=0.3)
+    assert route.ttft_ms == pytest.approx(1300)
+
+
+def test_parse_routes():
+    assert parse_routes("groq=llama-3.1-8b, openrouter=meta/llama:free,") == [
+        ("groq", "llama-3.1-8b"),
+        ("openrouter", "meta/llama:free"),
+    ]
+    with pytest.raises(ValueError, match="provider=model"):
+        parse_routes("groq")
+
+
+def test_pool_needs_a_route():
+    with pytest.raises(ValueError):
+        LLMPool([])
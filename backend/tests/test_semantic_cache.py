@@ -0,0 +1,41 @@
+import numpy as np
+
+import semantic_cache
+from semantic_cache import SemanticCache
+
+
+def unit(*values):
+    return np.array(values, dtype=np.float32)
+
+
+def test_paraphrase_above_threshold_hits_and_unrelated_query_misses():
+    cache = SemanticCache(max_entries=4, threshold=0.9)
+    cache.put("christian", "anxious about work", unit(1, 0, 0), ["Phil 4:6"])
+
+    value, similarity, issue = cache.get("christian", unit(0.95, 0.05, 0))
+    assert value == ["Phil 4:6"] and issue == "anxious about work" and similarity > 0.9
+
+    value, _, _ = cache.get("christian", unit(0, 1, 0))
+    assert value is None
+    assert cache.get("jewish", unit(1, 0, 0))[0] is None  # tables are per tradition
+
+
+def test_entries_expire_after_ttl(clock, monkeypatch):
+    monkeypatch.setattr(semantic_cache.time, "monotonic", clock)
+    cache = SemanticCache(max_entries=4, threshold=0.9, ttl_seconds=60)
+    cache.put("christian", "lonely", unit(0, 1, 0), ["Ps 23"])
+
+    clock.advance(61)
+    assert cache.get("christian", unit(0, 1, 0))[0] is None
+
+
+def test_full_table_overwrites_the_least_recently_used_slot():
+    cache = SemanticCache(max_entries=2, threshold=0.99)
+    cache.put("christian", "a", unit(1, 0, 0), "A")
+    cache.put("christian", "b", unit(0, 1, 0), "B")
+    cache.get("christian", unit(1, 0, 0))  # "b" is now the least recently used
+    cache.put("christian", "c", unit(0, 0, 1), "C")
+
+    assert cache.get("christian", unit(0, 1, 0))[0] is None
+    assert cache.get("christian", unit(1, 0, 0))[0] == "A"
+    assert cache.stats()["evictions"] == 1
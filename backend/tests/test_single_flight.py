@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+def test_late_subscriber_gets_emitted_prefix_then_live_events():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+        starts = []
+
+        async def source():
+            starts.append(1)
+            yield "a"
+            yield "b"
+            await release.wait()
+            yield "c"
+
+        first = asyncio.create_task(collect(flights.stream("key", source)))
+        await asyncio.sleep(0.01)  # "a" and "b" are out before the second request arrives
+        second = asyncio.create_task(collect(flights.stream("key", source)))
+        await asyncio.sleep(0.01)
+        release.set()
+
+        return await first, await second, starts, flights.stats()
+
+    first, second, starts, stats = asyncio.run(scenario())
+    assert first == second == ["a", "b", "c"]
+    assert len(starts) == 1
+    assert stats == {"in_flight": 0, "started": 1, "coalesced": 1}
+
+
+def test_finished_flight_is_not_reused():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def source():
+            calls.append(1)
+            yield len(calls)
+
+        first = await collect(flights.stream("key", source))
+        second = await collect(flights.stream("key", source))
+        return first, second
+
+    assert asyncio.run(scenario()) == ([1], [2])
+
+
+def test_upstream_error_reaches_every_subscriber_after_the_prefix():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def source():
+            yield "a"
+            await release.wait()
+            raise RuntimeError("upstream failed")
+
+        async def subscribe():
+            received = []
+            with pytest.raises(RuntimeError, match="upstream failed"):
+                async for event in flights.stream("key", source):
+                    received.append(event)
+            return received
+
+        first = asyncio.create_task(subscribe())
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(subscribe())
+        await asyncio.sleep(0.01)
+        release.set()
+        return await first, await second, len(flights)
+
+    first, second, in_flight = asyncio.run(scenario())
+    assert first == second == ["a"]
+    assert in_flight == 0
+
+
+def test_disconnecting_subscriber_does_not_cancel_the_upstream():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+        finished = []
+
+        async def source():
+            yield "a"
+            await release.wait()
+            yield "b"
+            finished.append(True)
+
+        leaving = asyncio.create_task(collect(flights.stream("key", source)))
+        staying = asyncio.create_task(collect(flights.stream("key", source)))
+        await asyncio.sleep(0.01)
+        leaving.cancel()
+        release.set()
+        return await staying, finished
+
+    assert asyncio.run(scenario()) == (["a", "b"], [True])
@@ -0,0 +1,72 @@
+"""
+Solace - Upstream Connection Pre-warming
+
+After a cold start the first request would pay DNS + TCP + TLS setup to
+Pinecone, OpenRouter and Tavily one after another. Warmer runs one cheap
+request per configured upstream concurrently at startup, so the pooled
+keep-alive connections are already open, and can repeat that periodically
+(and on /healthz pings) so idle sockets don't get closed.
+
+Each upstream's last result (ok, latency, time, error) is kept for /healthz.
+"""
+
+import asyncio
+import time
+
+DEFAULT_TIMEOUT = 5.0
+
+
+class Warmer:
+    """Concurrent warm-up probes with per-upstream state"""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self.probes = {}
+        self.state = {}
+        self.warming = None
+
+    def register(self, name: str, probe):
+        """`probe` is an async callable that opens (and reuses) the upstream's pooled connection"""
+        self.probes[name] = probe
+
+    async def _warm_one(self, name: str, probe):
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), timeout=self.timeout)
+            error = None
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        self.state[name] = {
+            "warm": error is None,
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+            "at": time.time(),
+            "error": error,
+        }
+
+    async def warm_all(self):
+        await asyncio.gather(*(self._warm_one(name, probe) for name, probe in self.probes.items()))
+        return self.state
+
+    def age(self) -> float:
+        """Seconds since the oldest upstream was last warmed (inf if never)"""
+        if len(self.state) < len(self.probes) or not self.state:
+            return float("inf")
+        return time.time() - min(entry["at"] for entry in self.state.values())
+
+    def warm_in_background(self, max_age: float):
+        """Re-warm without blocking the caller if the last warm is older than `max_age`"""
+        if self.age() < max_age or (self.warming is not None and not self.warming.done()):
+            return
+        self.warming = asyncio.create_task(self.warm_all())
+
+    async def keep_alive(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.warm_all()
+
+    def stats(self) -> dict:
+        now = time.time()
+        return {
+            name: {"warm": entry["warm"], "ms": entry["ms"], "age_s": round(now - entry["at"], 1), "error": entry["error"]}
+            for name, entry in self.state.items()
+        }
@@ -7,6 +7,7 @@ Uses Pinecone's integrated embedding with nvidia/llama-text-embed-v2.
 
 Chunks: 3 consecutive verses
 Metadata: testament (OT/NT), book, chapter, reference
+Also exports a local mmap-able embedding store (see local_store.py)
 """
 
 import xml.etree.ElementTree as ET
@@ -16,6 +17,7 @@ import time
 from datetime import datetime
 from dotenv import load_dotenv
 from pinecone import Pinecone
+from local_store import export_local_store
 
 load_dotenv()
 
@@ -24,6 +26,8 @@ INPUT_FILE = "./engwebp_vpl.xml"
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY", "")
 INDEX_HOST = "solace-t42ww4d.svc.aped-4627-b74a.pinecone.io"
 CHUNK_SIZE = 3  # Verses per chunk
+EXPORT_LOCAL_STORE = True  # Also write the local store for RETRIEVAL_BACKEND=local
+LOCAL_STORE_DIR = "./store/bible"
 
 # Bible book name mappings
 BOOK_NAMES = {
@@ -209,6 +213,10 @@ def main():
     # Upload to Pinecone
     upload_to_pinecone(records)
     
+    # Export local embedding store
+    if EXPORT_LOCAL_STORE:
+        export_local_store(Pinecone(api_key=PINECONE_API_KEY), records, LOCAL_STORE_DIR)
+    
     elapsed = datetime.now() - start_time
     print(f"\n⏱️  Total time: {elapsed.total_seconds():.1f} seconds")
     print("=" * 70)
@@ -7,6 +7,7 @@ Uses Pinecone's integrated embedding with nvidia/llama-text-embed-v2.
 Chunks: 10 consecutive lines (preserves narrative context)
 Metadata: testament (HP), book, chapter, reference
 Source: gastonstat/harry-potter-data CSV
+Also exports a local mmap-able embedding store (see local_store.py)
 """
 
 import csv
@@ -15,6 +16,7 @@ import time
 from collections import defaultdict
 from dotenv import load_dotenv
 from pinecone import Pinecone
+from local_store import export_local_store
 
 # Load environment variables
 load_dotenv()
@@ -27,6 +29,8 @@ CSV_PATH = "./books/harry_potter_books.csv"  # Download from: https://raw.github
 # Chunking settings
 LINES_PER_CHUNK = 10  # Group 10 consecutive lines into one chunk (1-2 paragraphs)
 BATCH_SIZE = 96  # Pinecone's limit for integrated embedding
+EXPORT_LOCAL_STORE = True  # Also write the local store for RETRIEVAL_BACKEND=local
+LOCAL_STORE_DIR = "./store/harry_potter"
 
 # Pinecone uses llama-text-embed-v2 (1024 dimensions) with integrated embedding
 # It requires a "text" field in the metadata for auto-embedding
@@ -227,6 +231,10 @@ def main():
     # Step 3: Upload to Pinecone
     upload_to_pinecone(chunks, BATCH_SIZE)
     
+    # Step 4: Export local embedding store
+    if EXPORT_LOCAL_STORE:
+        export_local_store(Pinecone(api_key=PINECONE_API_KEY), chunks, LOCAL_STORE_DIR)
+    
     print()
     print("=" * 60)
     print("🎉 All done! Harry Potter wisdom is now searchable!")
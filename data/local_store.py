@@ -0,0 +1,241 @@
+"""
+Solace - Local Embedding Store Exporter
+
+Shared export stage for the ingestion scripts. Embeds chunks with the same
+Pinecone Inference model the hosted index uses and writes a compact binary
+store the backend can memory-map at startup (see backend/local_index.py).
+
+Rows are written sorted by testament so each testament is a contiguous slice
+the backend can search on its own (filtered searches skip the other blocks).
+
+Store layout (one directory per corpus):
+    store.json       - manifest (count, dimension, dtype, model, testament partitions)
+    embeddings.npy   - (N, D) L2-normalized float16 matrix, mmap-able
+    embeddings_int8.npy + int8_scales.npy
+                     - per-dimension int8 quantization of the same vectors
+    bm25.npz         - BM25 inverted index over the chunk texts (postings in
+                       CSR form + the tokenizer settings used to build it)
+    texts.bin        - UTF-8 chunk texts, concatenated
+    metadata.jsonl   - one row per vector: id, reference, book, book_name,
+                       chapter, testament, translation, text_offset, text_length
+
+After each export the IVF-PQ index for RETRIEVAL_BACKEND=ivfpq is rebuilt
+over all stores next to this one (store/ivfpq.npz) - training it needs the
+full float32 corpus in memory, so it happens here rather than at startup.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+EMBED_MODEL = "llama-text-embed-v2"  # Same model as the Pinecone index
+EMBED_BATCH_SIZE = 96  # Pinecone Inference limit per embed call
+STORE_DTYPE = "float16"
+TESTAMENT_ORDER = {"OT": 0, "NT": 1, "HP": 2}
+
+# BM25 settings (stored in bm25.npz so the backend tokenizes queries the same way)
+BM25_K1 = 1.2
+BM25_B = 0.75
+TOKEN_PATTERN = r"[a-z0-9]+"
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "he", "her", "his", "i",
+    "in", "is", "it", "its", "me", "my", "of", "on", "or", "she", "that", "the", "their", "them",
+    "they", "this", "to", "was", "were", "will", "with", "you", "your"
+}
+
+# Store directories in the backend's default LOCAL_INDEX_DIRS order (IVF-PQ rows follow it)
+STORE_ORDER = ["bible", "harry_potter"]
+IVFPQ_FILE = "ivfpq.npz"
+IVFPQ_SUBQUANTIZERS = int(os.getenv("IVFPQ_SUBQUANTIZERS", "64"))  # Bytes per chunk
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+# Metadata fields copied from each record into metadata.jsonl
+METADATA_FIELDS = ["reference", "book", "book_name", "chapter", "testament", "translation"]
+
+
+def embed_passages(pc, texts, batch_size=EMBED_BATCH_SIZE):
+    """Embed chunk texts with Pinecone Inference (passage input type)"""
+    vectors = []
+    total_batches = (len(texts) + batch_size - 1) // batch_size
+
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        batch_num = (i // batch_size) + 1
+
+        for attempt in range(3):
+            try:
+                embeddings = pc.inference.embed(
+                    model=EMBED_MODEL,
+                    inputs=batch,
+                    parameters={"input_type": "passage", "truncate": "END"}
+                )
+                break
+            except Exception as e:
+                if "RESOURCE_EXHAUSTED" in str(e) or "429" in str(e):
+                    wait_time = 60 * (attempt + 1)
+                    print(f"   ⏸️  Rate limited, waiting {wait_time} seconds...")
+                    time.sleep(wait_time)
+                else:
+                    raise
+        else:
+            raise RuntimeError(f"Embedding batch {batch_num} failed after 3 retries")
+
+        for embedding in embeddings.data:
+            vectors.append(embedding.values if hasattr(embedding, 'values') else embedding['values'])
+
+        print(f"   ✓ Embedded batch {batch_num}/{total_batches} ({len(batch)} chunks)")
+
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def quantize_int8(vectors):
+    """Symmetric per-dimension int8 quantization -> (codes, scales)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=0) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.round(vectors / scales), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def stem(token: str) -> str:
+    """Crude plural folding ("psalms" -> "psalm") - mirrored by the backend query tokenizer"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str):
+    return [stem(token) for token in re.findall(TOKEN_PATTERN, text.lower()) if token not in STOPWORDS]
+
+
+def write_bm25_index(texts, path):
+    """Write a BM25 inverted index (one posting list per term, CSR layout)"""
+    postings = defaultdict(list)
+    doc_lengths = np.zeros(len(texts), dtype=np.int32)
+    for doc_id, text in enumerate(texts):
+        tokens = tokenize(text)
+        doc_lengths[doc_id] = len(tokens)
+        for term, tf in Counter(tokens).items():
+            postings[term].append((doc_id, tf))
+
+    terms = sorted(postings)
+    indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(postings[term]) for term in terms])
+    doc_ids = np.empty(indptr[-1], dtype=np.int32)
+    tfs = np.empty(indptr[-1], dtype=np.uint16)
+    for i, term in enumerate(terms):
+        rows = np.asarray(postings[term])
+        doc_ids[indptr[i]:indptr[i + 1]] = rows[:, 0]
+        tfs[indptr[i]:indptr[i + 1]] = np.minimum(rows[:, 1], np.iinfo(np.uint16).max)
+
+    np.savez(
+        path,
+        terms=np.asarray(terms),
+        indptr=indptr,
+        doc_ids=doc_ids,
+        tfs=tfs,
+        doc_lengths=doc_lengths,
+        k1=BM25_K1,
+        b=BM25_B,
+        token_pattern=TOKEN_PATTERN,
+        stopwords=np.asarray(sorted(STOPWORDS)),
+        stem_plurals=True
+    )
+
+
+def write_local_store(records, vectors, out_dir):
+    """Write records + their embeddings as an mmap-able store directory"""
+    if len(records) != len(vectors):
+        raise ValueError(f"{len(records)} records but {len(vectors)} vectors")
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Group rows by testament (stable, so chunk order is kept within a testament)
+    order = sorted(range(len(records)), key=lambda i: TESTAMENT_ORDER.get(records[i].get("testament", ""), len(TESTAMENT_ORDER)))
+    records = [records[i] for i in order]
+    vectors = np.asarray(vectors, dtype=np.float32)[order]
+
+    # Normalize once here so the backend can score with a plain dot product
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = (vectors / norms).astype(STORE_DTYPE)
+
+    np.save(os.path.join(out_dir, "embeddings.npy"), vectors)
+
+    codes, scales = quantize_int8(vectors)
+    np.save(os.path.join(out_dir, "embeddings_int8.npy"), codes)
+    np.save(os.path.join(out_dir, "int8_scales.npy"), scales)
+
+    # Texts go in one blob; metadata rows point into it by byte offset
+    offset = 0
+    with open(os.path.join(out_dir, "texts.bin"), "wb") as texts_file, \
+            open(os.path.join(out_dir, "metadata.jsonl"), "w", encoding="utf-8") as meta_file:
+        for record in records:
+            text_bytes = record["text"].encode("utf-8")
+            texts_file.write(text_bytes)
+
+            row = {"id": record.get("_id", record.get("id"))}
+            row.update({field: record.get(field, "") for field in METADATA_FIELDS})
+            row["text_offset"] = offset
+            row["text_length"] = len(text_bytes)
+            meta_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+            offset += len(text_bytes)
+
+    # References are indexed too so "Psalm 23" or "Chapter 33" match lexically
+    write_bm25_index(
+        [f"{record.get('reference', '')} {record['text']}" for record in records],
+        os.path.join(out_dir, "bm25.npz")
+    )
+
+    partitions = {}
+    for row, record in enumerate(records):
+        start, _ = partitions.get(record.get("testament", ""), (row, row))
+        partitions[record.get("testament", "")] = (start, row + 1)
+
+    manifest = {
+        "count": len(records),
+        "dimension": int(vectors.shape[1]),
+        "dtype": STORE_DTYPE,
+        "model": EMBED_MODEL,
+        "normalized": True,
+        "partitions": partitions
+    }
+    with open(os.path.join(out_dir, "store.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    size_mb = (vectors.nbytes + offset) / 1024 / 1024
+    print(f"   ✓ Wrote local store: {out_dir} ({len(records):,} chunks, {size_mb:.1f} MB)")
+
+
+def export_local_store(pc, records, out_dir):
+    """Embed records and write them to a local store directory"""
+    print(f"\n💾 Exporting local store to {out_dir}...")
+    vectors = embed_passages(pc, [record["text"] for record in records])
+    write_local_store(records, vectors, out_dir)
+    write_ivfpq_index(os.path.dirname(os.path.normpath(out_dir)) or ".")
+
+
+def write_ivfpq_index(store_root, m: int = IVFPQ_SUBQUANTIZERS):
+    """Train + save the IVF-PQ index over every store under `store_root` (same order as LOCAL_INDEX_DIRS)"""
+    store_dirs = [
+        os.path.join(store_root, name) for name in STORE_ORDER
+        if os.path.exists(os.path.join(store_root, name, "store.json"))
+    ]
+    if not store_dirs:
+        return
+
+    sys.path.insert(0, BACKEND_DIR)
+    from local_index import LocalIndex
+    from ivfpq_index import IvfPqIndex
+
+    print(f"\n🗜️  Building IVF-PQ index over {', '.join(os.path.basename(d) for d in store_dirs)}...")
+    index = IvfPqIndex.build(LocalIndex.load(store_dirs), m=m)
+    path = os.path.join(store_root, IVFPQ_FILE)
+    index.save(path)
+    print(f"   ✓ Wrote {path} ({index.nbytes / 1024 / 1024:.1f} MB resident)")
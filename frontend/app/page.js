@@ -85,19 +85,22 @@ export default function Home() {
                     block: 'start' 
                   })
                 }, 100)
-              } else if (data.type === 'verses') {
-                // Store verses and show them immediately
+              } else if (data.type === 'verses' || data.type === 'verses_provisional') {
+                // Show verses immediately; final 'verses' replace provisional ones (pre-rerank)
+                const firstVerses = tempVerses === null
                 tempVerses = data.verses
                 setResult({ verses: tempVerses, explanation: '' })
                 setLoading(false) // Stop loading spinner once verses appear
                 
-                // Scroll to results
-                setTimeout(() => {
-                  document.getElementById('results')?.scrollIntoView({ 
-                    behavior: 'smooth', 
-                    block: 'start' 
-                  })
-                }, 100)
+                // Scroll to results (once)
+                if (firstVerses) {
+                  setTimeout(() => {
+                    document.getElementById('results')?.scrollIntoView({ 
+                      behavior: 'smooth', 
+                      block: 'start' 
+                    })
+                  }, 100)
+                }
               } else if (data.type === 'explanation_chunk') {
                 // Stream explanation text
                 tempExplanation += data.content